@@ -0,0 +1,145 @@
+"""Headless batch lookup: resolve many titles and write their episode IDs.
+
+Usage:
+    python batch.py titles.txt --journal run.journal --output results.jsonl
+
+``titles.txt`` holds one IMDb URL or tt ID per line. With ``--journal``,
+finished titles and seasons are checkpointed, so re-running the same
+command after a crash or throttling only fetches what is still missing.
+"""
+import argparse
+import json
+import re
+import sys
+from typing import Optional
+
+import imdb_lookup
+from imdb_lookup import CheckpointJournal, fetch_series, set_parse_workers
+from profiling import PROFILE_DIR, LookupProfiler
+
+
+def read_titles(path: str) -> list[str]:
+    """Return the unique tt IDs found in *path*, in file order."""
+    titles: list[str] = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            match = re.search(r"tt\d+", line)
+            if match and match.group(0) not in titles:
+                titles.append(match.group(0))
+    return titles
+
+
+def run_batch(
+        titles: list[str],
+        journal: Optional[CheckpointJournal] = None,
+        out=sys.stdout,
+) -> int:
+    """Look up every title, writing one JSON line per finished title.
+
+    Returns the number of titles that failed.
+    """
+    failed = 0
+    for index, title in enumerate(titles, start=1):
+        prefix = f"[{index}/{len(titles)}] {title}"
+        try:
+            if journal and journal.is_done(title):
+                series_id, _, seasons = journal.resolved(title)
+                season_amount = len(seasons)
+                episodes_by_season = journal.seasons(series_id)
+                print(f"{prefix}: already done, skipped", file=sys.stderr)
+            else:
+                series_id, episodes_by_season, season_amount = fetch_series(
+                    title,
+                    on_progress=lambda msg: print(f"{prefix}: {msg}", file=sys.stderr),
+                    journal=journal,
+                )
+        except Exception as e:
+            failed += 1
+            print(f"{prefix}: Error: {e}", file=sys.stderr)
+            continue
+
+        out.write(json.dumps(
+            result_record(title, series_id, episodes_by_season, season_amount)
+        ) + "\n")
+        out.flush()
+    return failed
+
+
+def result_record(
+        title: str, series_id: str, episodes_by_season: dict[int, list[tuple]], season_amount: int
+) -> dict:
+    """The JSON object written for one finished title."""
+    return {
+        "title": title,
+        "series": series_id,
+        "season_amount": season_amount,
+        "seasons": {
+            str(season): {str(ep_num): ep_tt for ep_num, ep_tt in eps}
+            for season, eps in sorted(episodes_by_season.items())
+        },
+    }
+
+
+def print_identity_stats(file=sys.stderr):
+    """One line per User-Agent / proxy identity: requests, 429s, errors, latency."""
+    for row in imdb_lookup.IDENTITY_POOL.stats():
+        if not row["requests"]:
+            continue
+        benched = f", benched {row['benched_for']:.0f}s" if row["benched_for"] else ""
+        print(
+            f"  {row['proxy']} {row['user_agent'][:40]}: {row['requests']} requests, "
+            f"{row['throttled']} throttled, {row['errors']} errors, "
+            f"{row['latency_ms']} ms{benched}",
+            file=file,
+        )
+
+
+def main_cli(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Batch fetch IMDb episode IDs.")
+    parser.add_argument("titles", help="file with one IMDb URL or tt ID per line")
+    parser.add_argument("-o", "--output", help="JSON-lines output file (default: stdout)")
+    parser.add_argument(
+        "-j", "--journal",
+        help="checkpoint journal; re-run with the same file to resume",
+    )
+    parser.add_argument(
+        "--fetch-workers", type=int, default=imdb_lookup.FETCH_WORKERS,
+        help="concurrent page downloads per title",
+    )
+    parser.add_argument(
+        "--parse-workers", type=int, default=imdb_lookup.PARSE_WORKERS,
+        help="parser processes (0 = parse in the download threads)",
+    )
+    parser.add_argument(
+        "--profile", metavar="DIR", default=PROFILE_DIR or None,
+        help="write a CPU / stack-sample / memory profile of the run to DIR",
+    )
+    args = parser.parse_args(argv)
+
+    imdb_lookup.FETCH_WORKERS = args.fetch_workers
+    set_parse_workers(args.parse_workers)
+
+    titles = read_titles(args.titles)
+    journal = CheckpointJournal(args.journal) if args.journal else None
+    # Titles finished by an earlier run are re-emitted from the journal
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    profiler = LookupProfiler(args.profile, "batch") if args.profile else None
+    if profiler:
+        profiler.start()
+    try:
+        failed = run_batch(titles, journal=journal, out=out)
+    finally:
+        if profiler:
+            print(f"Profile report: {profiler.stop()}", file=sys.stderr)
+        if out is not sys.stdout:
+            out.close()
+        if journal:
+            journal.close()
+
+    print(f"Done — {len(titles) - failed}/{len(titles)} titles", file=sys.stderr)
+    print_identity_stats()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,166 @@
+"""Persistent reverse index: episode tt ID -> series, season and episode number.
+
+Every season page parsed by ``imdb_lookup`` is added to the index, so an
+episode seen in any earlier lookup is found again with one local query
+instead of a series crawl. The index lives in ``IMDB_EPISODE_INDEX``
+(default ``~/.imdb-episode-index.db``; set it empty to turn indexing off).
+
+    python episode_index.py lookup tt0959621 tt1232456
+    python episode_index.py lookup - < ids.txt
+    python episode_index.py import results.jsonl
+    python episode_index.py stats
+
+``lookup`` prints one JSON line per ID (``null`` fields when not indexed)
+and exits with 1 if any ID was missing. ``import`` adds results written by
+``batch.py`` or ``work_queue.py export``.
+
+The index uses SQLite's rollback journal rather than WAL, so it can live in
+a home directory that ``work_queue.py`` hosts share over a network
+filesystem. A database error raises ``EpisodeIndexError``, which names the
+file; ``imdb_lookup`` reports the first one and carries on without the index.
+"""
+import argparse
+import contextlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from typing import Optional
+
+INDEX_PATH = os.environ.get(
+    "IMDB_EPISODE_INDEX", os.path.join(os.path.expanduser("~"), ".imdb-episode-index.db")
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS episodes (
+    episode  TEXT PRIMARY KEY,
+    series   TEXT NOT NULL,
+    season   INTEGER NOT NULL,  -- as IMDb labels it (a year for shows listed by year)
+    number   INTEGER NOT NULL,
+    updated  REAL
+);
+CREATE INDEX IF NOT EXISTS episodes_series ON episodes (series, season);
+"""
+
+
+class EpisodeIndexError(Exception):
+    """Raised when the index file cannot be opened, read or written."""
+
+
+class EpisodeIndex:
+    """SQLite-backed map of episode IDs, safe to share between threads."""
+
+    def __init__(self, path: str = INDEX_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        with self._errors():
+            self.db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+            self.db.execute("PRAGMA journal_mode=DELETE")
+            self.db.executescript(SCHEMA)
+
+    @contextlib.contextmanager
+    def _errors(self):
+        try:
+            yield
+        except sqlite3.Error as e:
+            raise EpisodeIndexError(
+                f"Episode index {self.path}: {e} "
+                "(repair or delete it, or set IMDB_EPISODE_INDEX= to turn indexing off)"
+            ) from e
+
+    def close(self):
+        with self._lock:
+            self.db.close()
+
+    def add_season(self, series_id: str, season: int, episodes: list[tuple]):
+        """Record every ``(ep_num, ep_tt)`` of one parsed season."""
+        now = time.time()
+        with self._lock, self._errors():
+            self.db.execute("BEGIN")
+            try:
+                self.db.executemany(
+                    "INSERT OR REPLACE INTO episodes VALUES (?, ?, ?, ?, ?)",
+                    [(ep_tt, series_id, season, ep_num, now) for ep_num, ep_tt in episodes],
+                )
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+            self.db.execute("COMMIT")
+
+    def lookup(self, episode_id: str) -> Optional[tuple[str, int, int]]:
+        """Return ``(series_id, season, ep_num)`` if *episode_id* is indexed."""
+        with self._lock, self._errors():
+            return self.db.execute(
+                "SELECT series, season, number FROM episodes WHERE episode = ?",
+                (episode_id,),
+            ).fetchone()
+
+    def counts(self) -> tuple[int, int]:
+        """Return ``(episodes, series)`` held by the index."""
+        with self._lock, self._errors():
+            return self.db.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT series) FROM episodes"
+            ).fetchone()
+
+
+def open_default_index() -> Optional[EpisodeIndex]:
+    """The index at ``INDEX_PATH``, or None when indexing is off."""
+    return EpisodeIndex(INDEX_PATH) if INDEX_PATH else None
+
+
+def main_cli(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Local episode ID index.")
+    parser.add_argument("--index", default=INDEX_PATH, help=f"index file (default: {INDEX_PATH})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    lookup = commands.add_parser("lookup", help="find the series, season and number of episodes")
+    lookup.add_argument("ids", nargs="+", help="tt IDs or URLs; - reads them from stdin")
+
+    add = commands.add_parser("import", help="index results from batch.py or work_queue.py export")
+    add.add_argument("results", help="JSON-lines results file")
+
+    commands.add_parser("stats", help="show how much is indexed")
+
+    args = parser.parse_args(argv)
+    if not args.index:
+        parser.error("no index file (IMDB_EPISODE_INDEX is empty)")
+    index = EpisodeIndex(args.index)
+    missing = 0
+    try:
+        if args.command == "lookup":
+            text = " ".join(sys.stdin.read() if arg == "-" else arg for arg in args.ids)
+            for episode_id in dict.fromkeys(re.findall(r"tt\d+", text)):
+                series_id, season, ep_num = index.lookup(episode_id) or (None, None, None)
+                missing += series_id is None
+                print(json.dumps({
+                    "episode": episode_id, "series": series_id, "season": season, "number": ep_num,
+                }))
+
+        elif args.command == "import":
+            added = 0
+            with open(args.results, encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    for season, eps in record["seasons"].items():
+                        index.add_season(
+                            record["series"], int(season),
+                            [(int(ep_num), ep_tt) for ep_num, ep_tt in eps.items()],
+                        )
+                        added += len(eps)
+            print(f"Indexed {added} episode{'s' if added != 1 else ''}.", file=sys.stderr)
+
+        elif args.command == "stats":
+            episodes, series = index.counts()
+            print(f"{episodes} episodes from {series} series in {args.index}")
+    finally:
+        index.close()
+    return 1 if missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,1266 @@
+"""Headless IMDb episode-ID lookups, shared by the GUI and batch tools.
+
+Nothing here imports tkinter. The blocking API (``fetch_series`` and the
+functions it is built from) runs on ``requests``; ``AsyncLookup`` offers the
+same lookups for asyncio code, so one event loop can run hundreds of them.
+"""
+import asyncio
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import AsyncIterator, Callable, Optional
+
+import requests
+from bs4 import BeautifulSoup
+
+from episode_index import EpisodeIndex, EpisodeIndexError, open_default_index
+
+try:
+    import httpx  # optional: native asyncio HTTP for AsyncLookup
+except ImportError:
+    httpx = None
+
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.6 Safari/605.1.15",
+    "Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:133.0) Gecko/20100101 Firefox/133.0",
+]
+
+# Comma-separated proxy URLs; "direct" adds an identity with no proxy
+PROXIES = [p.strip() for p in os.environ.get("IMDB_PROXIES", "").split(",") if p.strip()]
+
+
+class Identity:
+    """One User-Agent + egress pair and its recent health."""
+
+    def __init__(self, user_agent: str, proxy: Optional[str] = None):
+        self.user_agent = user_agent
+        self.proxy = proxy
+        self.headers = {"User-Agent": user_agent}
+        self.proxies = {"http": proxy, "https": proxy} if proxy else None
+        self.requests = 0
+        self.throttled = 0  # 429 responses
+        self.errors = 0  # 5xx responses and connection failures
+        self.latency = 0.0  # moving average, seconds
+        self.error_rate = 0.0  # moving average of throttled/failed requests
+        self.strikes = 0  # failures since the last good response
+        self.benched_until = 0.0
+
+
+class IdentityPool:
+    """Rotate requests over identities, benching slow or throttled ones.
+
+    ``acquire`` picks an identity at random, weighted towards low latency and
+    low error rates; ``report`` feeds the outcome back. A 429 benches the
+    identity straight away (longer each time it recurs), three failures in a
+    row or a latency far above the rest of the pool bench it too. When every
+    identity is benched, ``acquire`` waits until the first is due back.
+    """
+
+    SMOOTHING = 0.2
+    SLOW_FACTOR = 3.0
+    MAX_BENCH = 900.0
+
+    def __init__(self, identities: list[Identity], bench_seconds: float = 30.0):
+        if not identities:
+            raise ValueError("IdentityPool needs at least one identity")
+        self.identities = identities
+        self.bench_seconds = bench_seconds
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(
+            cls, user_agents: list[str] = USER_AGENTS, proxies: Optional[list[str]] = None,
+    ) -> "IdentityPool":
+        """One identity per User-Agent and proxy pair (no proxies = direct only)."""
+        egress = [None if p == "direct" else p for p in (proxies or [])] or [None]
+        return cls([Identity(agent, proxy) for proxy in egress for agent in user_agents])
+
+    def try_acquire(self) -> tuple[Optional[Identity], float]:
+        """``(identity, 0)``, or ``(None, seconds)`` until one is due back."""
+        now = time.monotonic()
+        with self._lock:
+            ready = [i for i in self.identities if i.benched_until <= now]
+            if not ready:
+                return None, min(i.benched_until for i in self.identities) - now
+            weights = [(1.0 - i.error_rate) ** 2 / max(i.latency, 0.05) for i in ready]
+            return random.choices(ready, weights)[0], 0.0
+
+    def acquire(self) -> Identity:
+        """Pick an identity, sleeping while every one is benched."""
+        while True:
+            identity, delay = self.try_acquire()
+            if identity:
+                return identity
+            time.sleep(delay)
+
+    def report(self, identity: Identity, status: Optional[int], latency: float):
+        """Record one request; *status* is None when it never got a response."""
+        failed = status is None or status == 429 or status >= 500
+        with self._lock:
+            a = self.SMOOTHING
+            identity.latency = latency if not identity.requests else (
+                identity.latency * (1 - a) + latency * a
+            )
+            identity.error_rate = identity.error_rate * (1 - a) + (a if failed else 0.0)
+            identity.requests += 1
+            if status == 429:
+                identity.throttled += 1
+            elif failed:
+                identity.errors += 1
+            if not failed:
+                identity.strikes = 0
+                peers = self._peer_latency(identity)
+                if peers is not None and identity.latency > self.SLOW_FACTOR * peers:
+                    self._bench(identity, self.bench_seconds)
+                    # Come back on probation rather than be benched again at once
+                    identity.latency = peers
+                return
+            identity.strikes += 1
+            if status == 429 or identity.strikes >= 3:
+                self._bench(identity, self.bench_seconds * 2 ** (identity.strikes - 1))
+
+    def _peer_latency(self, identity: Identity) -> Optional[float]:
+        """Median latency of the other identities with enough requests to judge,
+        or None while *identity* or its peers have too few."""
+        others = [i.latency for i in self.identities if i is not identity and i.requests >= 5]
+        if identity.requests < 5 or not others:
+            return None
+        return statistics.median(others)
+
+    def _bench(self, identity: Identity, seconds: float):
+        identity.benched_until = time.monotonic() + min(seconds, self.MAX_BENCH)
+
+    def stats(self) -> list[dict]:
+        """Per-identity counters, for logging or display."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "user_agent": i.user_agent,
+                    "proxy": i.proxy or "direct",
+                    "requests": i.requests,
+                    "throttled": i.throttled,
+                    "errors": i.errors,
+                    "latency_ms": round(i.latency * 1000),
+                    "error_rate": round(i.error_rate, 3),
+                    "benched_for": round(max(0.0, i.benched_until - now), 1),
+                }
+                for i in self.identities
+            ]
+
+
+IDENTITY_POOL = IdentityPool.from_settings(proxies=PROXIES)
+
+
+# Network fetches run in threads; parsing can be moved to worker processes so
+# bulk runs are not serialised on the GIL. 0 parse workers = parse in-thread.
+FETCH_WORKERS = int(os.environ.get("IMDB_FETCH_WORKERS", "4") or 4)
+PARSE_WORKERS = int(os.environ.get("IMDB_PARSE_WORKERS", "0") or 0)
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool_lock = threading.Lock()
+
+
+def set_parse_workers(workers: int):
+    """Set the parse process-pool size (0 parses in the calling thread)."""
+    global PARSE_WORKERS, _parse_pool
+    with _parse_pool_lock:
+        PARSE_WORKERS = max(0, workers)
+        if _parse_pool is not None:
+            _parse_pool.shutdown(wait=False, cancel_futures=True)
+            _parse_pool = None
+
+
+def _shared_parse_pool() -> Optional[ProcessPoolExecutor]:
+    """The parse process pool, started on first use; None if parsing in-thread."""
+    global _parse_pool
+    if PARSE_WORKERS <= 0:
+        return None
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+        return _parse_pool
+
+
+def _run_parser(parser: Callable, *args):
+    """Run a ``parse_*`` function in the process pool, or inline if disabled."""
+    pool = _shared_parse_pool()
+    if pool is None:
+        return parser(*args)
+    return pool.submit(parser, *args).result()
+
+
+# Streamed fetches stop reading once the markup we parse has arrived, and
+# refuse bodies larger than MAX_BODY_BYTES.
+STREAM_FETCH = os.environ.get("IMDB_STREAM_FETCH", "1") != "0"
+MAX_BODY_BYTES = int(os.environ.get("IMDB_MAX_BODY_BYTES", str(5 * 1024 * 1024)))
+STREAM_CHUNK_SIZE = 16 * 1024
+
+
+class ResponseTooLarge(Exception):
+    """Raised when a response body exceeds ``MAX_BODY_BYTES``."""
+
+
+# A stop rule lists alternatives; each is a run of byte markers that must
+# appear in that order. Reading stops once any alternative is complete.
+StopRule = tuple[tuple[bytes, ...], ...]
+
+# Everything we parse is rendered above the footer and the trailing
+# ``__NEXT_DATA__`` script
+stop_at_page_data: StopRule = ((b"<footer",), (b'id="__NEXT_DATA__"',))
+
+# Pages whose paging info we need: read through the end of the
+# ``__NEXT_DATA__`` script, which holds the episode totals
+stop_after_page_data: StopRule = ((b'id="__NEXT_DATA__"', b"</script>"),)
+
+
+class _BodyReader:
+    """Accumulate a streamed body until a stop marker or the size cap.
+
+    Markers are found with plain byte searches; each search resumes just
+    before the end of what was already scanned, so a marker split across
+    two chunks is still found and no byte is scanned more than twice.
+    """
+
+    def __init__(self, url: str, stop_at: StopRule):
+        self.url = url
+        self.stop_at = stop_at
+        self.body = bytearray()
+        # Per alternative: index of the next marker and where to search from
+        self._progress = [[0, 0] for _ in stop_at]
+
+    def _reached(self) -> bool:
+        for markers, progress in zip(self.stop_at, self._progress):
+            while True:
+                marker = markers[progress[0]]
+                found = self.body.find(marker, progress[1])
+                if found < 0:
+                    progress[1] = max(progress[1], len(self.body) - len(marker) + 1)
+                    break
+                progress[0] += 1
+                progress[1] = found + len(marker)
+                if progress[0] == len(markers):
+                    return True
+        return False
+
+    def feed(self, chunk: bytes) -> bool:
+        """Add *chunk*; returns True once nothing more needs to be read."""
+        self.body += chunk
+        if self._reached():
+            return True
+        if len(self.body) > MAX_BODY_BYTES:
+            raise ResponseTooLarge(
+                f"{self.url} is larger than {MAX_BODY_BYTES} bytes"
+            )
+        return False
+
+
+def _read_streamed(response, url: str, stop_at: StopRule) -> bytes:
+    reader = _BodyReader(url, stop_at)
+    for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+        if reader.feed(chunk):
+            break
+    return bytes(reader.body)
+
+
+# Upper bound on simultaneous requests across every lookup in the process
+MAX_CONNECTIONS = int(os.environ.get("IMDB_MAX_CONNECTIONS", "8") or 8)
+_connection_budget = threading.BoundedSemaphore(MAX_CONNECTIONS)
+
+
+def fetch_html(
+        url: str, stop_at: StopRule = stop_at_page_data
+) -> bytes:
+    for _ in range(3):
+        identity = IDENTITY_POOL.acquire()
+        try:
+            with _connection_budget:
+                started = time.perf_counter()
+                try:
+                    response = requests.get(
+                        url, headers=identity.headers, proxies=identity.proxies,
+                        timeout=10, stream=STREAM_FETCH,
+                    )
+                except Exception:
+                    IDENTITY_POOL.report(identity, None, time.perf_counter() - started)
+                    raise
+                IDENTITY_POOL.report(identity, response.status_code, time.perf_counter() - started)
+                with response:
+                    if response.status_code != 200:
+                        continue
+                    if STREAM_FETCH:
+                        return _read_streamed(response, url, stop_at)
+                    return response.content
+        except ResponseTooLarge:
+            raise
+        except Exception:
+            pass
+    raise Exception(f"Failed to fetch {url} after 3 attempts")
+
+
+def fetch_page(url: str) -> BeautifulSoup:
+    return BeautifulSoup(fetch_html(url), "html.parser")
+
+
+# IMDb renders at most this many episodes per listing page
+EPISODE_PAGE_SIZE = 50
+
+
+def _next_data(soup: BeautifulSoup) -> Optional[dict]:
+    """Return the page's ``__NEXT_DATA__`` JSON, if it was read."""
+    script = soup.find("script", id="__NEXT_DATA__")
+    if not script or not script.string:
+        return None
+    try:
+        return json.loads(script.string)
+    except ValueError:
+        return None
+
+
+def _find_in_json(node, predicate: Callable[[dict], bool]) -> Optional[dict]:
+    """Depth-first search for the first dict in *node* matching *predicate*."""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if predicate(node):
+                return node
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+    return None
+
+
+def parse_episode_page(html: bytes) -> dict:
+    """Parse one episode listing page.
+
+    Returns ``{"episodes": [(ep_num, tt), ...], "total": int | None,
+    "has_more": bool}``. Episode numbers come from IMDb's own ``S1.E5``
+    labels when every episode has one, otherwise from list position.
+    ``total`` is only known when the ``__NEXT_DATA__`` script was read.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+
+    data = _next_data(soup)
+    section = data and _find_in_json(
+        data,
+        lambda d: isinstance(d.get("items"), list) and "total" in d and any(
+            isinstance(item, dict) and str(item.get("id", "")).startswith("tt")
+            for item in d["items"]
+        ),
+    )
+    if section:
+        items = [
+            item for item in section["items"]
+            if isinstance(item, dict) and re.fullmatch(r"tt\d+", str(item.get("id", "")))
+        ]
+        numbers = [str(item.get("episode", "")) for item in items]
+        tt_list = [item["id"] for item in items]
+        return {
+            "episodes": _number_episodes(tt_list, numbers),
+            "total": int(section["total"]),
+            "has_more": bool(section.get("hasNextPage")),
+        }
+
+    articles = soup.select("article.episode-item-wrapper")
+    tt_list, numbers = [], []
+    for article in articles:
+        for link in article.find_all("a", class_="ipc-title-link-wrapper"):
+            match = re.search(r"(tt\d+)\D", link.get("href", ""))
+            if match:
+                tt_list.append(match.group(1))
+                label = re.search(r"S\d+\.E(\d+)", link.get_text())
+                numbers.append(label.group(1) if label else "")
+
+    has_more = bool(
+        soup.select_one(".ipc-see-more__button, .ipc-see-more__text")
+    ) or len(tt_list) >= EPISODE_PAGE_SIZE
+    return {
+        "episodes": _number_episodes(
+            tt_list,
+            numbers,
+            start=0 if soup.find(
+                "div", class_="ipc-title__text", string=lambda text: text and "E0" in text
+            ) else 1,
+        ),
+        "total": None,
+        "has_more": has_more,
+    }
+
+
+def _number_episodes(tt_list: list[str], numbers: list[str], start: int = 1) -> list[tuple]:
+    if all(n.isdigit() for n in numbers) and len(set(numbers)) == len(numbers):
+        return [(int(n), tt_id) for n, tt_id in zip(numbers, tt_list)]
+    if "0" in numbers:
+        start = 0
+    return list(enumerate(tt_list, start=start))
+
+
+def merge_episode_pages(pages: list[dict]) -> list[tuple]:
+    """Join listing pages in order, dropping repeats and renumbering if the
+    per-page position numbers collide."""
+    seen: set[str] = set()
+    merged: list[tuple] = []
+    for page in pages:
+        for ep_num, ep_tt in page["episodes"]:
+            if ep_tt not in seen:
+                seen.add(ep_tt)
+                merged.append((ep_num, ep_tt))
+    numbers = [ep_num for ep_num, _ in merged]
+    if len(set(numbers)) != len(numbers):
+        start = merged[0][0] if merged else 1
+        merged = [(start + i, ep_tt) for i, (_, ep_tt) in enumerate(merged)]
+    return sorted(merged)
+
+
+def parse_listing(html: bytes) -> Optional[tuple[str, list[int]]]:
+    """Return ``("season", [1, 2, ...])`` from the season tabs, or
+    ``("year", [2019, 2020, ...])`` for shows IMDb only lists by year.
+
+    Season values are returned as labelled, so year-numbered seasons
+    (``?season=2019``) work. None means the tablist was not on the page.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    tablist = soup.select('ul[role="tablist"]')
+    if len(tablist) < 2:
+        return None
+    seasons = [int(a.text) for a in tablist[1].find_all("a") if a.text.strip().isdigit()]
+    if seasons:
+        return "season", list(dict.fromkeys(seasons))
+
+    data = _next_data(soup)
+    years = data and _find_in_json(data, lambda d: isinstance(d.get("years"), list))
+    if years:
+        values = [
+            int(year["value"]) for year in years["years"]
+            if isinstance(year, dict) and str(year.get("value", "")).isdigit()
+        ]
+        return "year", sorted(set(values))
+    return "season", []
+
+
+def episodes_url(root_id: str, kind: Optional[str] = None, value: Optional[int] = None, page: int = 1) -> str:
+    """URL of an episode listing: the landing page, or one season/year page."""
+    if kind is None:
+        return f"https://imdb.com/title/{root_id}/episodes/"
+    url = f"https://imdb.com/title/{root_id}/episodes?{kind}={value}"
+    return url if page <= 1 else f"{url}&page={page}"
+
+
+def page_count(page: dict) -> int:
+    """Number of listing pages implied by a fully read first page."""
+    if not page["total"] or not page["episodes"]:
+        return 1
+    return -(-page["total"] // len(page["episodes"]))
+
+
+class IncompleteSeason(Exception):
+    """Raised when the listing pages hold fewer episodes than IMDb's total.
+
+    *episodes* keeps what the pages did hold, so a lookup can carry on
+    with them.
+    """
+
+    def __init__(self, series_id: str, season: int, episodes: list[tuple], total: int):
+        super().__init__(
+            f"{series_id} season {season}: listing pages gave {len(episodes)} of {total} episodes"
+        )
+        self.series_id = series_id
+        self.season = season
+        self.episodes = episodes
+        self.total = total
+
+
+def season_from_pages(root_id: str, value: int, pages: list[dict]) -> list[tuple]:
+    """Merge listing pages, raising ``IncompleteSeason`` when the result falls
+    short of the total reported by the first page."""
+    episodes = merge_episode_pages(pages)
+    total = pages[0]["total"]
+    if total and len(episodes) < total:
+        raise IncompleteSeason(root_id, value, episodes, total)
+    return episodes
+
+
+def _adds_episodes(first: dict, page: dict) -> bool:
+    """Whether *page* lists any episode missing from *first*."""
+    return bool({tt for _, tt in page["episodes"]} - {tt for _, tt in first["episodes"]})
+
+
+def parse_root_id(html: bytes, tt_id: str) -> str:
+    """Return the series tt ID that the title page of *tt_id* belongs to."""
+    soup = BeautifulSoup(html, "html.parser")
+    h3_tags = soup.find_all("h3")
+
+    for tag in h3_tags:
+        if "Episodes" in tag.text:
+            return tt_id
+        else:
+            a_tag = soup.find("a", {"aria-label": "View all episodes"})
+            if a_tag:
+                root_match = re.search(r"tt\d+", a_tag.get("href", ""))
+                if root_match:
+                    return root_match.group(0)
+
+    return tt_id
+
+
+def find_listing(url: str) -> tuple[str, list[int]]:
+    for _ in range(3):
+        listing = _run_parser(parse_listing, fetch_html(url))
+        if listing is not None:
+            if not listing[1]:
+                # No season tabs: re-read with page data for the year list
+                listing = _run_parser(
+                    parse_listing, fetch_html(url, stop_after_page_data)
+                ) or listing
+            return listing
+    raise Exception("Failed to find season amount after 3 attempts")
+
+
+# Reverse index of every parsed season, opened on first use. The first
+# error turns it off for the rest of the run; lookups carry on without it.
+_episode_index: Optional[EpisodeIndex] = None
+_episode_index_opened = False
+_episode_index_error: Optional[EpisodeIndexError] = None
+_episode_index_lock = threading.Lock()
+
+
+def episode_index() -> Optional[EpisodeIndex]:
+    """The shared episode index, or None when it is turned off or has failed."""
+    global _episode_index, _episode_index_opened
+    with _episode_index_lock:
+        if not _episode_index_opened:
+            _episode_index_opened = True
+            try:
+                _episode_index = open_default_index()
+            except EpisodeIndexError as e:
+                _episode_index_failed(e)
+                raise
+        return _episode_index
+
+
+def episode_index_error() -> Optional[EpisodeIndexError]:
+    """The error that turned the episode index off, if any."""
+    return _episode_index_error
+
+
+def _episode_index_failed(error: EpisodeIndexError):
+    global _episode_index, _episode_index_error
+    if _episode_index_error is None:
+        print(f"{error} — continuing without the episode index", file=sys.stderr)
+    _episode_index, _episode_index_error = None, error
+
+
+def locate_episode(episode_id: str) -> Optional[tuple[str, int, int]]:
+    """``(series_id, season, ep_num)`` for an indexed episode, without any request.
+
+    Raises ``EpisodeIndexError`` if the index fails; it is off from then on.
+    """
+    index = episode_index()
+    if not index:
+        return None
+    try:
+        return index.lookup(episode_id)
+    except EpisodeIndexError as e:
+        with _episode_index_lock:
+            _episode_index_failed(e)
+        raise
+
+
+def _indexed_series(episode_id: str) -> Optional[str]:
+    """The indexed series of *episode_id*; a failing index just means a lookup."""
+    try:
+        located = locate_episode(episode_id)
+    except EpisodeIndexError:
+        return None
+    return located[0] if located else None
+
+
+def _index_season(root_id: str, season: int, episodes: list[tuple]) -> list[tuple]:
+    """Add a fetched season to the index. A failing index is turned off
+    rather than failing the lookup, since the season itself was fetched."""
+    try:
+        index = episode_index()
+        if index and episodes:
+            index.add_season(root_id, season, episodes)
+    except EpisodeIndexError as e:
+        with _episode_index_lock:
+            _episode_index_failed(e)
+    return episodes
+
+
+def get_season_episodes(root_id: str, kind: str, value: int) -> list[tuple]:
+    """All episodes of one season (or year), following every listing page.
+
+    The first page is read only up to the markup. If it looks truncated it
+    is re-read with the page data to learn the total. Page 2 is fetched
+    next; only if it adds episodes are the remaining pages fetched
+    concurrently and merged in order. Raises ``IncompleteSeason`` when the
+    merged pages still fall short of the total.
+    """
+    url = episodes_url(root_id, kind, value)
+    first = _run_parser(parse_episode_page, fetch_html(url))
+    if not first["has_more"]:
+        return _index_season(root_id, value, sorted(first["episodes"]))
+
+    def fetch_page(page: int) -> dict:
+        return _run_parser(
+            parse_episode_page,
+            fetch_html(episodes_url(root_id, kind, value, page), stop_after_page_data),
+        )
+
+    first = fetch_page(1)
+    pages = page_count(first)
+    loaded = [first]
+    if pages > 1:
+        loaded.append(fetch_page(2))
+    if pages > 2 and _adds_episodes(first, loaded[1]):
+        with ThreadPoolExecutor(max_workers=max(1, FETCH_WORKERS)) as pool:
+            loaded += pool.map(fetch_page, range(3, pages + 1))
+    return _index_season(root_id, value, season_from_pages(root_id, value, loaded))
+
+
+def extract_id(str_contain_id: str) -> str:
+    match = re.search(r"tt\d+", str_contain_id)
+    if not match:
+        return ""
+    tt_id = match.group(0)
+    series_id = _indexed_series(tt_id)
+    if series_id:
+        return series_id
+
+    return _run_parser(
+        parse_root_id, fetch_html("https://imdb.com/title/" + tt_id), tt_id
+    )
+
+
+class LookupCancelled(Exception):
+    """Raised inside a lookup when its cancel event has been set."""
+
+
+class CheckpointJournal:
+    """Append-only JSON-lines journal of finished lookup steps.
+
+    Each resolved title, fetched season and completed title is written and
+    fsynced as one line, so a restarted batch can skip work that already
+    finished. A torn last line from a crash is ignored on load.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._resolved: dict[str, tuple[str, str, list[int]]] = {}
+        self._seasons: dict[str, dict[int, list[tuple]]] = {}
+        self._done: set[str] = set()
+
+        needs_newline = False
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                data = f.read()
+            needs_newline = bool(data) and not data.endswith(b"\n")
+            for line in data.decode("utf-8", errors="replace").splitlines():
+                try:
+                    self._apply(json.loads(line))
+                except (ValueError, KeyError, TypeError):
+                    continue
+
+        self._file = open(path, "a", encoding="utf-8")
+        if needs_newline:
+            self._file.write("\n")
+            self._file.flush()
+
+    def _apply(self, record: dict):
+        event = record["event"]
+        if event == "series":
+            # Journals written before year listings only hold a season count
+            values = record.get("values") or list(range(1, int(record["seasons"]) + 1))
+            self._resolved[record["title"]] = (
+                record["series"], record.get("kind", "season"), [int(v) for v in values]
+            )
+        elif event == "season":
+            self._seasons.setdefault(record["series"], {})[int(record["season"])] = [
+                (int(ep_num), ep_tt) for ep_num, ep_tt in record["episodes"]
+            ]
+        elif event == "done":
+            self._done.add(record["title"])
+
+    def _append(self, record: dict):
+        with self._lock:
+            self._apply(record)
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def record_series(self, title: str, series_id: str, kind: str, values: list[int]):
+        self._append({
+            "event": "series", "title": title, "series": series_id,
+            "seasons": len(values), "kind": kind, "values": values,
+        })
+
+    def record_season(self, series_id: str, season: int, episodes: list[tuple]):
+        self._append(
+            {"event": "season", "series": series_id, "season": season, "episodes": episodes}
+        )
+
+    def record_done(self, title: str):
+        self._append({"event": "done", "title": title})
+
+    def is_done(self, title: str) -> bool:
+        with self._lock:
+            return title in self._done
+
+    def resolved(self, title: str) -> Optional[tuple[str, str, list[int]]]:
+        """Return ``(series_id, kind, values)`` if *title* was resolved before."""
+        with self._lock:
+            return self._resolved.get(title)
+
+    def seasons(self, series_id: str) -> dict[int, list[tuple]]:
+        with self._lock:
+            return dict(self._seasons.get(series_id, {}))
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class SeasonPriority:
+    """The order a lookup fetches its seasons in; may change while it runs.
+
+    The preferred season goes first, then the latest one (what matters most
+    for an ongoing show), then the rest in order. ``prefer`` can be called
+    from any thread and reorders every season not yet requested.
+    """
+
+    def __init__(self, preferred: Optional[int] = None):
+        self._lock = threading.Lock()
+        self._preferred = preferred
+
+    @property
+    def preferred(self) -> Optional[int]:
+        with self._lock:
+            return self._preferred
+
+    def prefer(self, season: Optional[int]):
+        with self._lock:
+            self._preferred = season
+
+    def order(self, seasons: list[int]) -> list[int]:
+        """A series' full season list in the order it should be requested."""
+        if not seasons:
+            return []
+        first = [s for s in (self.preferred, max(seasons)) if s in seasons]
+        return list(dict.fromkeys(first + sorted(seasons)))
+
+
+def fetch_series(
+        root_id: str,
+        on_progress: Optional[Callable[[str], None]] = None,
+        cancel: Optional[threading.Event] = None,
+        journal: Optional[CheckpointJournal] = None,
+        priority: Optional[SeasonPriority] = None,
+        on_season: Optional[Callable[[str, int, list[tuple], list[int]], None]] = None,
+        on_incomplete: Optional[Callable[[IncompleteSeason], None]] = None,
+) -> tuple[str, dict[int, list[tuple]], int]:
+    """Resolve *root_id* to its series and fetch the episode IDs of every season.
+
+    Returns ``(series_id, episodes_by_season, season_amount)``. Progress
+    messages go to *on_progress*; setting *cancel* aborts between requests.
+    With a *journal*, steps it already holds are skipped and new ones recorded.
+    Seasons are requested in *priority* order (latest first by default) and
+    each is passed to ``on_season(series_id, season, episodes, seasons)`` as
+    soon as it arrives.
+
+    A season whose pages fall short of IMDb's total keeps the episodes found.
+    It is reported to *on_progress* and *on_incomplete*, and left out of
+    the journal, so a resumed run fetches it again.
+    """
+    def _progress(msg: str):
+        if cancel is not None and cancel.is_set():
+            raise LookupCancelled(root_id)
+        if on_progress:
+            on_progress(msg)
+
+    title_id = root_id
+    checkpoint = journal.resolved(title_id) if journal else None
+    if checkpoint:
+        root_id, kind, seasons = checkpoint
+        _progress(f"Resuming {root_id} from journal...")
+    else:
+        _progress(f"Resolving {root_id}...")
+        resolved_id = extract_id(root_id)
+        if resolved_id != root_id:
+            _progress(f"Resolved to series {resolved_id}...")
+            root_id = resolved_id
+
+        _progress(f"Fetching seasons for {root_id}...")
+        kind, seasons = find_listing(episodes_url(root_id))
+        if journal:
+            journal.record_series(title_id, root_id, kind, seasons)
+    season_amount = len(seasons)
+
+    episodes_by_season: dict[int, list[tuple]] = {
+        season: eps
+        for season, eps in (journal.seasons(root_id) if journal else {}).items()
+        if season in seasons
+    }
+    if on_season:
+        for season, eps in episodes_by_season.items():
+            on_season(root_id, season, eps, seasons)
+
+    priority = priority or SeasonPriority()
+    waiting = [season for season in seasons if season not in episodes_by_season]
+    workers = max(1, FETCH_WORKERS)
+    pending = {}
+    incomplete: list[int] = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        try:
+            while waiting or pending:
+                # Only fill free slots, so a priority change still reorders the rest
+                queued = [season for season in priority.order(seasons) if season in waiting]
+                for season in queued[:workers - len(pending)]:
+                    waiting.remove(season)
+                    pending[pool.submit(get_season_episodes, root_id, kind, season)] = season
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    season = pending.pop(future)
+                    try:
+                        episodes_by_season[season] = future.result()
+                    except IncompleteSeason as e:
+                        episodes_by_season[season] = e.episodes
+                        incomplete.append(season)
+                        _progress(f"Warning: {e}")
+                        if on_incomplete:
+                            on_incomplete(e)
+                    else:
+                        if journal:
+                            journal.record_season(root_id, season, episodes_by_season[season])
+                    if on_season:
+                        on_season(root_id, season, episodes_by_season[season], seasons)
+                _progress(
+                    f"Fetched season {len(episodes_by_season)}/{season_amount}..."
+                )
+        finally:
+            for future in pending:
+                future.cancel()
+
+    if journal and not incomplete:
+        journal.record_done(title_id)
+
+    episodes_by_season = dict(sorted(episodes_by_season.items()))
+    return root_id, episodes_by_season, season_amount
+
+
+async def _run_parser_async(parser: Callable, *args):
+    """``_run_parser`` for coroutines: parses in the process pool, or in a thread
+    when there is none, so the event loop never runs the parser itself."""
+    pool = _shared_parse_pool()
+    if pool is None:
+        return await asyncio.to_thread(parser, *args)
+    return await asyncio.wrap_future(pool.submit(parser, *args))
+
+
+class AsyncLookup:
+    """Asyncio counterpart of ``fetch_series`` and the functions it is built from.
+
+    All lookups made through one instance share an HTTP client and a budget
+    of *max_connections* concurrent requests::
+
+        async with AsyncLookup() as lookup:
+            series_id, episodes_by_season, season_amount = await lookup.resolve_series(url)
+            async for season, episodes in lookup.iter_seasons(series_id):
+                ...
+
+    Requests go through ``httpx`` when it is installed; without it each
+    request falls back to the blocking ``fetch_html`` in a worker thread.
+    """
+
+    def __init__(self, max_connections: int = MAX_CONNECTIONS, client=None):
+        self._budget = asyncio.Semaphore(max(1, max_connections))
+        self._max_connections = max_connections
+        self._own_client = client is None and httpx is not None
+        self._client = client
+        # Own clients are made per proxy, since httpx binds a proxy to a client
+        self._clients: dict[Optional[str], object] = {}
+        if self._own_client:
+            self._client = self._client_for(None)
+
+    def _client_for(self, proxy: Optional[str]):
+        if not self._own_client:
+            return self._client
+        if proxy not in self._clients:
+            self._clients[proxy] = httpx.AsyncClient(
+                proxy=proxy,
+                timeout=10,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=self._max_connections),
+            )
+        return self._clients[proxy]
+
+    async def __aenter__(self) -> "AsyncLookup":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+    async def _acquire_identity(self) -> Identity:
+        """``IdentityPool.acquire`` that waits on the event loop, not in a sleep."""
+        while True:
+            identity, delay = IDENTITY_POOL.try_acquire()
+            if identity:
+                return identity
+            await asyncio.sleep(delay)
+
+    async def _fetch_once(self, identity: Identity, url: str, stop_at: StopRule) -> Optional[bytes]:
+        client = self._client_for(identity.proxy)
+        started = time.perf_counter()
+        reported = False
+        try:
+            async with client.stream("GET", url, headers=identity.headers) as response:
+                IDENTITY_POOL.report(identity, response.status_code, time.perf_counter() - started)
+                reported = True
+                if response.status_code != 200:
+                    return None
+                if not STREAM_FETCH:
+                    return await response.aread()
+                reader = _BodyReader(url, stop_at)
+                async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+                    if reader.feed(chunk):
+                        break
+                return bytes(reader.body)
+        except ResponseTooLarge:
+            raise
+        except Exception:
+            # Failures after the headers were already counted as that response
+            if not reported:
+                IDENTITY_POOL.report(identity, None, time.perf_counter() - started)
+            raise
+
+    async def fetch_html(
+            self, url: str, stop_at: StopRule = stop_at_page_data
+    ) -> bytes:
+        if self._client is None:
+            async with self._budget:
+                return await asyncio.to_thread(fetch_html, url, stop_at)
+        for _ in range(3):
+            # Wait out a fully benched pool before taking a connection slot
+            identity = await self._acquire_identity()
+            try:
+                async with self._budget:
+                    body = await self._fetch_once(identity, url, stop_at)
+                if body is not None:
+                    return body
+            except ResponseTooLarge:
+                raise
+            except Exception:
+                pass
+        raise Exception(f"Failed to fetch {url} after 3 attempts")
+
+    async def find_listing(self, url: str) -> tuple[str, list[int]]:
+        for _ in range(3):
+            listing = await _run_parser_async(parse_listing, await self.fetch_html(url))
+            if listing is not None:
+                if not listing[1]:
+                    listing = await _run_parser_async(
+                        parse_listing, await self.fetch_html(url, stop_after_page_data)
+                    ) or listing
+                return listing
+        raise Exception("Failed to find season amount after 3 attempts")
+
+    async def _episode_page(self, url: str, full: bool = False) -> dict:
+        html = await self.fetch_html(url, stop_after_page_data if full else stop_at_page_data)
+        return await _run_parser_async(parse_episode_page, html)
+
+    async def get_season_episodes(self, root_id: str, kind: str, value: int) -> list[tuple]:
+        """Awaitable ``get_season_episodes``; extra pages are fetched concurrently."""
+        url = episodes_url(root_id, kind, value)
+        first = await self._episode_page(url)
+        if not first["has_more"]:
+            return await asyncio.to_thread(_index_season, root_id, value, sorted(first["episodes"]))
+
+        first = await self._episode_page(url, full=True)
+        pages = page_count(first)
+        loaded = [first]
+        if pages > 1:
+            loaded.append(await self._episode_page(episodes_url(root_id, kind, value, 2), full=True))
+        if pages > 2 and _adds_episodes(first, loaded[1]):
+            loaded += await asyncio.gather(*(
+                self._episode_page(episodes_url(root_id, kind, value, page), full=True)
+                for page in range(3, pages + 1)
+            ))
+        return await asyncio.to_thread(
+            _index_season, root_id, value, season_from_pages(root_id, value, loaded)
+        )
+
+    async def extract_id(self, str_contain_id: str) -> str:
+        match = re.search(r"tt\d+", str_contain_id)
+        if not match:
+            return ""
+        tt_id = match.group(0)
+        series_id = await asyncio.to_thread(_indexed_series, tt_id)
+        if series_id:
+            return series_id
+        html = await self.fetch_html("https://imdb.com/title/" + tt_id)
+        return await _run_parser_async(parse_root_id, html, tt_id)
+
+    async def iter_seasons(
+            self,
+            root_id: str,
+            listing: Optional[tuple[str, list[int]]] = None,
+            skip: tuple = (),
+            priority: Optional[SeasonPriority] = None,
+            on_incomplete: Optional[Callable[[IncompleteSeason], None]] = None,
+    ) -> AsyncIterator[tuple[int, list[tuple]]]:
+        """Yield ``(season, [(ep_num, ep_tt), ...])`` as each season arrives.
+
+        *root_id* must already be the series ID (see ``extract_id``);
+        *listing* is ``find_listing``'s result and is looked up if omitted.
+        All seasons are requested at once, queued for the connection budget
+        in *priority* order; closing the iterator early cancels the ones
+        still in flight. A short season is yielded with the episodes found,
+        after being passed to *on_incomplete*.
+        """
+        kind, seasons = listing or await self.find_listing(episodes_url(root_id))
+
+        async def _season(season: int) -> tuple[int, list[tuple]]:
+            try:
+                return season, await self.get_season_episodes(root_id, kind, season)
+            except IncompleteSeason as e:
+                if on_incomplete:
+                    on_incomplete(e)
+                return season, e.episodes
+
+        tasks = [
+            asyncio.ensure_future(_season(season))
+            for season in (priority or SeasonPriority()).order(seasons)
+            if season not in skip
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def resolve_series(
+            self,
+            root_id: str,
+            on_progress: Optional[Callable[[str], None]] = None,
+            journal: Optional[CheckpointJournal] = None,
+            priority: Optional[SeasonPriority] = None,
+            on_season: Optional[Callable[[str, int, list[tuple], list[int]], None]] = None,
+            on_incomplete: Optional[Callable[[IncompleteSeason], None]] = None,
+    ) -> tuple[str, dict[int, list[tuple]], int]:
+        """Awaitable ``fetch_series``: same arguments (minus *cancel*) and result.
+
+        Cancel by cancelling the awaiting task. Journal calls run in a thread,
+        since they share a lock with writes that fsync.
+        """
+        def _progress(msg: str):
+            if on_progress:
+                on_progress(msg)
+
+        title_id = root_id
+        checkpoint = await asyncio.to_thread(journal.resolved, title_id) if journal else None
+        if checkpoint:
+            root_id, kind, seasons = checkpoint
+            _progress(f"Resuming {root_id} from journal...")
+        else:
+            _progress(f"Resolving {root_id}...")
+            resolved_id = await self.extract_id(root_id)
+            if resolved_id != root_id:
+                _progress(f"Resolved to series {resolved_id}...")
+                root_id = resolved_id
+
+            _progress(f"Fetching seasons for {root_id}...")
+            kind, seasons = await self.find_listing(episodes_url(root_id))
+            if journal:
+                await asyncio.to_thread(journal.record_series, title_id, root_id, kind, seasons)
+        season_amount = len(seasons)
+
+        journaled = await asyncio.to_thread(journal.seasons, root_id) if journal else {}
+        episodes_by_season: dict[int, list[tuple]] = {
+            season: eps for season, eps in journaled.items() if season in seasons
+        }
+        if on_season:
+            for season, eps in episodes_by_season.items():
+                on_season(root_id, season, eps, seasons)
+
+        incomplete: list[int] = []
+
+        def _incomplete(e: IncompleteSeason):
+            incomplete.append(e.season)
+            _progress(f"Warning: {e}")
+            if on_incomplete:
+                on_incomplete(e)
+
+        async for season, episodes in self.iter_seasons(
+                root_id, (kind, seasons), skip=tuple(episodes_by_season), priority=priority,
+                on_incomplete=_incomplete,
+        ):
+            episodes_by_season[season] = episodes
+            if journal and season not in incomplete:
+                await asyncio.to_thread(journal.record_season, root_id, season, episodes)
+            if on_season:
+                on_season(root_id, season, episodes, seasons)
+            _progress(f"Fetched season {len(episodes_by_season)}/{season_amount}...")
+
+        if journal and not incomplete:
+            await asyncio.to_thread(journal.record_done, title_id)
+
+        episodes_by_season = dict(sorted(episodes_by_season.items()))
+        return root_id, episodes_by_season, season_amount
+
+
+async def resolve_series(
+        root_id: str, on_progress: Optional[Callable[[str], None]] = None
+) -> tuple[str, dict[int, list[tuple]], int]:
+    """One-off ``AsyncLookup.resolve_series``; reuse an ``AsyncLookup`` for many."""
+    async with AsyncLookup() as lookup:
+        return await lookup.resolve_series(root_id, on_progress=on_progress)
+
+
+# A tt ID as it appears in pasted text or an IMDb URL
+PREFETCH_ID_RE = re.compile(r"\b(tt\d{7,})\b")
+
+
+class _PrefetchJob:
+    """One speculative ``fetch_series`` run that a real lookup can take over."""
+
+    def __init__(self, tt_id: str, source: str):
+        self.tt_id = tt_id
+        self.source = source  # "entry" or "clipboard"
+        self.cancel_event = threading.Event()
+        self.done = threading.Event()
+        self.result: Optional[tuple[str, dict[int, list[tuple]], int]] = None
+        self.error: Optional[Exception] = None
+        self._lock = threading.Lock()
+        self._last_status = f"Resolving {tt_id}..."
+        self._listener: Optional[Callable[[str], None]] = None
+        # Seasons that arrived before anyone waited, replayed to the first waiter
+        self.priority = SeasonPriority()
+        self._seasons: list[tuple] = []
+        self._season_listener: Optional[Callable[..., None]] = None
+        self._incomplete: list[IncompleteSeason] = []
+        self._incomplete_listener: Optional[Callable[[IncompleteSeason], None]] = None
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        try:
+            self.result = fetch_series(
+                self.tt_id, on_progress=self._relay, cancel=self.cancel_event,
+                priority=self.priority, on_season=self._relay_season,
+                on_incomplete=self._relay_incomplete,
+            )
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done.set()
+
+    def _relay(self, msg: str):
+        with self._lock:
+            self._last_status = msg
+            listener = self._listener
+        if listener:
+            listener(msg)
+
+    def _relay_season(self, *season_args):
+        with self._lock:
+            self._seasons.append(season_args)
+            listener = self._season_listener
+        if listener:
+            listener(*season_args)
+
+    def _relay_incomplete(self, error: IncompleteSeason):
+        with self._lock:
+            self._incomplete.append(error)
+            listener = self._incomplete_listener
+        if listener:
+            listener(error)
+
+    def wait(
+            self,
+            on_progress: Optional[Callable[[str], None]] = None,
+            on_season: Optional[Callable[[str, int, list[tuple], list[int]], None]] = None,
+            on_incomplete: Optional[Callable[[IncompleteSeason], None]] = None,
+    ) -> tuple[str, dict[int, list[tuple]], int]:
+        """Block until the job finishes, forwarding its progress from now on.
+
+        *on_season* and *on_incomplete* also receive what arrived before the call.
+        """
+        with self._lock:
+            self._listener = on_progress
+            self._season_listener = on_season
+            self._incomplete_listener = on_incomplete
+            last_status = self._last_status
+            arrived = list(self._seasons)
+            short = list(self._incomplete)
+        if on_progress and not self.done.is_set():
+            on_progress(last_status)
+        if on_season:
+            for season_args in arrived:
+                on_season(*season_args)
+        if on_incomplete:
+            for error in short:
+                on_incomplete(error)
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class SeriesPrefetcher:
+    """Speculatively look up the tt ID the user is about to confirm.
+
+    Only one job runs at a time; starting a new tt ID cancels the previous one.
+    ``claim`` hands a matching job (running or finished) to the real lookup.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._job: Optional[_PrefetchJob] = None
+
+    def start(self, tt_id: str, source: str) -> bool:
+        """Begin prefetching *tt_id*; returns False if it is already in flight."""
+        with self._lock:
+            job = self._job
+            if job and job.tt_id == tt_id and not (job.done.is_set() and job.error):
+                return False
+            if job:
+                job.cancel_event.set()
+            self._job = _PrefetchJob(tt_id, source)
+            self._job.start()
+            return True
+
+    def cancel(self, source: Optional[str] = None):
+        """Cancel the current job (only if it came from *source*, when given)."""
+        with self._lock:
+            job = self._job
+            if job and (source is None or job.source == source):
+                job.cancel_event.set()
+                self._job = None
+
+    def claim(self, tt_id: str) -> Optional[_PrefetchJob]:
+        """Detach and return the job for *tt_id*, or None if there is none."""
+        with self._lock:
+            job = self._job
+            if not job or job.tt_id != tt_id:
+                return None
+            if job.done.is_set() and job.error is not None:
+                self._job = None
+                return None
+            self._job = None
+            return job
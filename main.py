@@ -1,17 +1,23 @@
 import os
+import multiprocessing
 import platform
-import random
+import queue
 import re
 import subprocess
 import sys
 import threading
+import time
 import tkinter as tk
 from tkinter import ttk
 import webbrowser
-from typing import Optional
+from typing import Callable, Optional
 
-import requests
-from bs4 import BeautifulSoup
+from episode_index import EpisodeIndexError
+from imdb_lookup import (
+    PREFETCH_ID_RE, IncompleteSeason, SeasonPriority, SeriesPrefetcher, episode_index_error,
+    fetch_series, locate_episode,
+)
+from profiling import PROFILE_DIR, LookupProfiler
 
 # Resolve sound file paths — handles both normal and PyInstaller bundled mode
 if getattr(sys, 'frozen', False):
@@ -62,86 +68,6 @@ def play_sound(sound_path: str = COPY_SOUND):
     threading.Thread(target=_play, daemon=True).start()
 
 
-USER_AGENTS = [
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.6 Safari/605.1.15",
-    "Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:133.0) Gecko/20100101 Firefox/133.0",
-]
-
-HEADERS = {
-    "User-Agent": random.choice(USER_AGENTS),
-}
-
-
-def fetch_page(url: str) -> BeautifulSoup:
-    for _ in range(3):
-        try:
-            response = requests.get(url, headers=HEADERS, timeout=10)
-            if response.status_code == 200:
-                return BeautifulSoup(response.content, "html.parser")
-        except Exception:
-            pass
-    raise Exception(f"Failed to fetch {url} after 3 attempts")
-
-
-def get_episode_tt(url: str) -> dict[int, str]:
-    start: int = 1
-    soup = fetch_page(url)
-
-    articles = soup.select("article.episode-item-wrapper")
-    links = [
-        link.get("href", "")
-        for article in articles
-        for link in article.find_all("a", class_="ipc-title-link-wrapper")
-    ]
-
-    links = filter(lambda href: re.search(r"(tt\d+)\D", href), links)
-    tt_list = [re.search(r"(tt\d+)\D", href).group(1) for href in links]
-
-    if soup.find(
-            "div", class_="ipc-title__text", string=lambda text: text and "E0" in text
-    ):
-        start = 0
-
-    return {idx: tt_id for idx, tt_id in enumerate(tt_list, start=start)}
-
-
-def find_season_amount(url: str) -> int:
-    for _ in range(3):
-        soup = fetch_page(url)
-        tablist = soup.select('ul[role="tablist"]')
-        if len(tablist) >= 2:
-            links_without_unknown = (
-                [a for a in tablist[1].find_all("a") if a.text.isdigit()]
-                if tablist[1]
-                else []
-            )
-            return len(links_without_unknown)
-    raise Exception("Failed to find season amount after 3 attempts")
-
-
-def extract_id(str_contain_id: str) -> str:
-    match = re.search(r"tt\d+", str_contain_id)
-    if not match:
-        return ""
-    tt_id = match.group(0)
-
-    soup = fetch_page("https://imdb.com/title/" + tt_id)
-    h3_tags = soup.find_all("h3")
-
-    for tag in h3_tags:
-        if "Episodes" in tag.text:
-            return tt_id
-        else:
-            a_tag = soup.find("a", {"aria-label": "View all episodes"})
-            if a_tag:
-                root_match = re.search(r"tt\d+", a_tag.get("href", ""))
-                if root_match:
-                    return root_match.group(0)
-
-    return tt_id
-
-
 def is_dark_mode() -> bool:
     """Detect if the system is using a dark color scheme."""
     system = platform.system()
@@ -222,11 +148,74 @@ def is_dark_mode() -> bool:
         return False
 
 
+class UiUpdateQueue:
+    """Thread-safe channel from worker threads to the Tk main loop.
+
+    Workers ``post`` callbacks instead of calling ``root.after`` directly. The
+    main loop drains the queue once per frame and stops after the frame
+    budget, leaving the rest for the next frame. A newer post with the same
+    key replaces one that has not run yet, so bursts of progress updates
+    collapse into one; ``key=None`` is never merged.
+    """
+
+    def __init__(self, root: tk.Tk, frame_ms: int = 33, budget_ms: float = 12.0):
+        self.root = root
+        self.frame_ms = frame_ms
+        self.budget = budget_ms / 1000
+        self._lock = threading.Lock()
+        self._pending: dict = {}
+        self._unique = 0
+        self.root.after(self.frame_ms, self._drain)
+
+    def post(self, key, callback: Callable, *args):
+        with self._lock:
+            if key is None:
+                self._unique += 1
+                key = ("unique", self._unique)
+            # Re-insert so the merged update runs after everything posted before it
+            self._pending.pop(key, None)
+            self._pending[key] = (callback, args)
+
+    def _drain(self):
+        with self._lock:
+            batch, self._pending = self._pending, {}
+
+        deadline = time.perf_counter() + self.budget
+        items = iter(list(batch.items()))
+        for key, (callback, args) in items:
+            try:
+                callback(*args)
+            except Exception:
+                # Same report as a failing Tk callback, traceback included
+                self.root.report_callback_exception(*sys.exc_info())
+            if time.perf_counter() > deadline:
+                break
+
+        leftover = dict(items)
+        if leftover:
+            with self._lock:
+                # Left-over updates go first unless a newer one superseded them
+                for key in self._pending:
+                    leftover.pop(key, None)
+                leftover.update(self._pending)
+                self._pending = leftover
+
+        self.root.after(self.frame_ms, self._drain)
+
+
+# Titles looked up at once from the GUI queue (requests still share MAX_CONNECTIONS)
+QUEUE_WORKERS = int(os.environ.get("IMDB_QUEUE_WORKERS", "3") or 3)
+
+# Clipboard managers read (and often take over) the clipboard right after
+# every copy; adaptive auto copy ignores reads this soon after serving an ID
+CLIPBOARD_READ_GRACE = 0.5
+
+
 class IMDbLookupApp:
     def __init__(self, root: tk.Tk):
         self.root = root
         self.root.title("IMDb ID Lookup")
-        self.root.minsize(700, 500)
+        self.root.minsize(700, 620)
 
         # Detect dark/light mode for adaptive colors
         self.dark_mode = is_dark_mode()
@@ -236,16 +225,46 @@ class IMDbLookupApp:
         self.episodes_by_season: dict[int, list[dict]] = {}
         self.episode_rows: list[dict] = []  # flat list currently displayed
         self.season_amount: int = 0
+        self.season_frames: dict[int, ttk.Frame] = {}  # one per displayed season
 
         # Auto-copy state
         self.auto_copy_active = False
         self.auto_copy_index = 0
         self.auto_copy_after_id: Optional[str] = None
         self.auto_copy_season_rows: list[dict] = []
+        self.auto_copy_started_at = 0.0
+        # Adaptive mode: bumped on every clipboard write so stale watchers stop
+        self.clip_generation = 0
+        self.served_text = ""
+        self.served_generation = 0
+        self.served_at = 0.0
+        self.clip_handlers_installed = False
+
+        # Speculative prefetch state
+        self.prefetcher = SeriesPrefetcher()
+        self.last_clipboard: Optional[str] = None
+        self.clipboard_poll_id: Optional[str] = None  # one polling chain at a time
+
+        # Profiling mode (IMDB_PROFILE=<dir>) — one profiler per lookup
+        self.profiler: Optional[LookupProfiler] = None
+        self.profiled_title: Optional[str] = None  # only its own lookup stops the profiler
+
+        # Worker threads hand UI work to the main loop through this queue
+        self.ui_updates = UiUpdateQueue(self.root)
+
+        # Title queue — finished results stay in memory for switching shows
+        self.queue_items: dict[str, dict] = {}
+        self.queue_jobs: queue.Queue = queue.Queue()
+        self.shown_title: Optional[str] = None
+        self.displayed_series: Optional[str] = None
+        self.pending_show: Optional[str] = None  # display this title when it finishes
 
         self._build_ui()
         self._bind_shortcuts()
 
+        for _ in range(max(1, QUEUE_WORKERS)):
+            threading.Thread(target=self._queue_worker, daemon=True).start()
+
     def _bind_shortcuts(self):
         """Explicitly bind Cmd/Ctrl shortcuts so they work with non-English input methods on macOS."""
         for widget in (self.root, self.search_entry):
@@ -282,13 +301,11 @@ class IMDbLookupApp:
         try:
             if isinstance(widget, (tk.Entry, ttk.Entry)):
                 if widget.selection_present():
-                    self.root.clipboard_clear()
-                    self.root.clipboard_append(widget.selection_get())
+                    self._set_clipboard(widget.selection_get())
             elif isinstance(widget, tk.Text):
                 sel = widget.get(tk.SEL_FIRST, tk.SEL_LAST)
                 if sel:
-                    self.root.clipboard_clear()
-                    self.root.clipboard_append(sel)
+                    self._set_clipboard(sel)
         except tk.TclError:
             pass
         return "break"
@@ -343,6 +360,13 @@ class IMDbLookupApp:
         )
         self.imdb_btn.pack(side=tk.RIGHT)
 
+        self.prefetch_var = tk.BooleanVar(value=False)
+        self.prefetch_check = ttk.Checkbutton(
+            top_label_row, text="⚡ Prefetch", variable=self.prefetch_var,
+            command=self._on_prefetch_toggled,
+        )
+        self.prefetch_check.pack(side=tk.RIGHT, padx=(0, 10))
+
         input_row = ttk.Frame(search_frame)
         input_row.pack(fill=tk.X, pady=(5, 0))
 
@@ -350,6 +374,7 @@ class IMDbLookupApp:
         self.search_entry = ttk.Entry(input_row, textvariable=self.search_var)
         self.search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
         self.search_entry.bind("<Return>", lambda e: self._on_search())
+        self.search_var.trace_add("write", lambda *_: self._on_search_input_changed())
 
         self.search_btn = ttk.Button(input_row, text="Fetch", command=self._on_search)
         self.search_btn.pack(side=tk.RIGHT)
@@ -360,6 +385,37 @@ class IMDbLookupApp:
             anchor=tk.W, padx=10, pady=(2, 2)
         )
 
+        # --- Queue ---
+        queue_frame = ttk.LabelFrame(self.root, text="Queue", padding=5)
+        queue_frame.pack(fill=tk.X, padx=10, pady=(0, 5))
+
+        queue_btn_row = ttk.Frame(queue_frame)
+        queue_btn_row.pack(side=tk.BOTTOM, fill=tk.X, pady=(4, 0))
+
+        ttk.Button(
+            queue_btn_row, text="📋 Paste List", command=self._paste_queue
+        ).pack(side=tk.LEFT)
+        ttk.Button(
+            queue_btn_row, text="🧹 Clear Finished", command=self._clear_finished
+        ).pack(side=tk.RIGHT)
+
+        self.queue_tree = ttk.Treeview(
+            queue_frame, columns=("series", "status"), height=4, selectmode="browse"
+        )
+        self.queue_tree.heading("#0", text="Title")
+        self.queue_tree.heading("series", text="Series")
+        self.queue_tree.heading("status", text="Progress")
+        self.queue_tree.column("#0", width=110, stretch=False)
+        self.queue_tree.column("series", width=110, stretch=False)
+        self.queue_tree.column("status", width=300)
+        queue_scrollbar = ttk.Scrollbar(
+            queue_frame, orient=tk.VERTICAL, command=self.queue_tree.yview
+        )
+        self.queue_tree.configure(yscrollcommand=queue_scrollbar.set)
+        queue_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.queue_tree.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.queue_tree.bind("<<TreeviewSelect>>", self._on_queue_select)
+
         # --- Pack bottom frames FIRST (bottom-up) so they always stay visible ---
         # --- Bottom buttons ---
         btn_frame = ttk.Frame(self.root)
@@ -384,6 +440,7 @@ class IMDbLookupApp:
             textvariable=self.season_var, width=4, state=tk.DISABLED
         )
         self.season_spinbox.pack(side=tk.LEFT, padx=(5, 10))
+        self.season_var.trace_add("write", lambda *_: self._on_season_changed())
 
         ttk.Label(auto_row1, text="Interval (sec):").pack(side=tk.LEFT)
         self.interval_var = tk.StringVar(value="2")
@@ -405,6 +462,12 @@ class IMDbLookupApp:
         )
         self.sound_check.pack(side=tk.LEFT, padx=(0, 10))
 
+        self.adaptive_var = tk.BooleanVar(value=False)
+        self.adaptive_check = ttk.Checkbutton(
+            auto_row1, text="⚡ Adaptive", variable=self.adaptive_var
+        )
+        self.adaptive_check.pack(side=tk.LEFT, padx=(0, 10))
+
         auto_row2 = ttk.Frame(auto_frame)
         auto_row2.pack(fill=tk.X, pady=(4, 0))
 
@@ -458,83 +521,421 @@ class IMDbLookupApp:
 
     def _set_status(self, msg: str):
         self.status_var.set(msg)
-        self.root.update_idletasks()
 
-    def _set_busy(self, busy: bool):
-        state = tk.DISABLED if busy else tk.NORMAL
-        self.search_btn.configure(state=state)
-        self.search_entry.configure(state=state)
+    # --- Speculative prefetch ---
+
+    def _on_prefetch_toggled(self):
+        if self.prefetch_var.get():
+            try:
+                self.last_clipboard = self.root.clipboard_get()
+            except tk.TclError:
+                self.last_clipboard = None
+            self._on_search_input_changed()
+            if self.clipboard_poll_id is None:
+                self._poll_clipboard()
+        else:
+            if self.clipboard_poll_id is not None:
+                self.root.after_cancel(self.clipboard_poll_id)
+                self.clipboard_poll_id = None
+            self.prefetcher.cancel()
+
+    def _on_search_input_changed(self):
+        if not self.prefetch_var.get():
+            return
+        match = PREFETCH_ID_RE.search(self.search_var.get().strip())
+        if match and self._is_queued(match.group(1)):
+            self.prefetcher.cancel("entry")
+        elif match:
+            if self.prefetcher.start(match.group(1), "entry"):
+                self._set_status(f"Prefetching {match.group(1)} in the background...")
+        else:
+            self.prefetcher.cancel("entry")
+
+    def _is_queued(self, tt_id: str) -> bool:
+        """True if the queue already has *tt_id* (done or in progress); prefetching it would crawl it again."""
+        item = self.queue_items.get(tt_id)
+        return bool(item) and item["state"] != "failed"
+
+    def _poll_clipboard(self):
+        """Watch the clipboard for a newly copied tt ID while prefetch is on."""
+        self.clipboard_poll_id = None
+        if not self.prefetch_var.get():
+            return
+        if self.auto_copy_active:
+            # Reading would count as a paste for adaptive auto copy
+            self.clipboard_poll_id = self.root.after(750, self._poll_clipboard)
+            return
+        try:
+            text = self.root.clipboard_get()
+        except tk.TclError:
+            text = None
+        if text != self.last_clipboard:
+            self.last_clipboard = text
+            match = PREFETCH_ID_RE.search(text or "")
+            if match and not self._is_queued(match.group(1)):
+                if self.prefetcher.start(match.group(1), "clipboard"):
+                    self._set_status(f"Prefetching {match.group(1)} from clipboard...")
+        self.clipboard_poll_id = self.root.after(750, self._poll_clipboard)
+
+    def _set_clipboard(self, text: str):
+        """Copy *text*, remembering it so the prefetch watcher ignores it."""
+        self.clip_generation += 1
+        self.root.clipboard_clear()
+        self.root.clipboard_append(text)
+        self.last_clipboard = text
 
     def _on_search(self):
         query = self.search_var.get().strip()
         if not query:
             return
 
-        if self.auto_copy_active:
-            self._stop_auto_copy()
-
-        tt_match = re.search(r"tt\d+", query)
-        if not tt_match:
+        # Several IDs/URLs pasted at once are all queued; the first is shown
+        tt_ids = list(dict.fromkeys(re.findall(r"tt\d+", query)))
+        if not tt_ids:
             self._set_status("Could not find a tt ID in your input. Paste an IMDb URL or tt ID.")
             return
 
-        root_id = tt_match.group(0)
-        self._set_busy(True)
-        self._set_status(f"Fetching {root_id}...")
-        threading.Thread(
-            target=self._fetch_and_display, args=(root_id,), daemon=True
-        ).start()
+        if self.auto_copy_active:
+            self._stop_auto_copy()
 
-    def _fetch_and_display(self, root_id: str):
+        root_id = tt_ids[0]
+        self._set_status(f"Fetching {root_id}...")
+        item = self.queue_items.get(root_id)
+        if PROFILE_DIR and not self.profiler and (not item or item["state"] == "failed"):
+            self.profiler = LookupProfiler(PROFILE_DIR, root_id)
+            self.profiled_title = root_id
+            self.profiler.start()
+        self.pending_show = root_id
+        self._enqueue_titles(tt_ids)
+
+    # --- Title queue ---
+
+    def _paste_queue(self):
+        """Queue every tt ID found in the clipboard."""
         try:
-            self.root.after(0, self._set_status, f"Resolving {root_id}...")
-            resolved_id = extract_id(root_id)
-            if resolved_id != root_id:
-                self.root.after(
-                    0, self._set_status, f"Resolved to series {resolved_id}..."
-                )
-                root_id = resolved_id
+            text = self.root.clipboard_get()
+        except tk.TclError:
+            text = ""
+        tt_ids = list(dict.fromkeys(re.findall(r"tt\d+", text)))
+        if not tt_ids:
+            self._set_status("No tt IDs found in the clipboard.")
+            return
+        self._enqueue_titles(tt_ids)
+        self._set_status(f"Queued {len(tt_ids)} title{'s' if len(tt_ids) != 1 else ''}.")
+
+    def _enqueue_titles(self, tt_ids: list[str]):
+        for tt_id in tt_ids:
+            item = self.queue_items.get(tt_id)
+            if item and item["state"] != "failed":
+                if item["state"] == "done" and tt_id == self.pending_show:
+                    self._show_queue_result(tt_id)
+                continue
+
+            self.queue_items[tt_id] = {
+                "state": "queued",
+                "result": None,
+                "priority": SeasonPriority(),
+                "partial": {},  # seasons that arrived before the whole series
+                "incomplete": {},  # season -> (episodes found, IMDb's total)
+            }
+            if self.queue_tree.exists(tt_id):
+                self.queue_tree.item(tt_id, values=("", "Queued"))
+            else:
+                self.queue_tree.insert("", tk.END, iid=tt_id, text=tt_id, values=("", "Queued"))
+            self.queue_jobs.put((tt_id, self.queue_items[tt_id]["priority"]))
 
-            self.root.after(
-                0, self._set_status, f"Fetching seasons for {root_id}..."
-            )
-            season_amount = find_season_amount(
-                f"https://imdb.com/title/{root_id}/episodes/"
-            )
+    def _queue_worker(self):
+        while True:
+            tt_id, priority = self.queue_jobs.get()
 
-            episodes_by_season: dict[int, list[tuple]] = {}
-            for season in range(1, season_amount + 1):
-                self.root.after(
-                    0,
-                    self._set_status,
-                    f"Fetching season {season}/{season_amount}...",
+            def _progress(msg: str, tt_id=tt_id):
+                self.ui_updates.post(("progress", tt_id), self._on_queue_progress, tt_id, msg)
+
+            def _season(series_id: str, season: int, episodes: list[tuple], seasons: list[int],
+                        tt_id=tt_id):
+                self.ui_updates.post(
+                    None, self._on_queue_season, tt_id, series_id, season, episodes, seasons
                 )
-                episode_ids = get_episode_tt(
-                    f"https://imdb.com/title/{root_id}/episodes?season={season}"
+
+            def _incomplete(error: IncompleteSeason, tt_id=tt_id):
+                self.ui_updates.post(None, self._on_queue_incomplete, tt_id, error)
+
+            # An indexed episode's own season is fetched first. The index is
+            # read here, not on the Tk thread, since it can wait on a busy file.
+            try:
+                located = locate_episode(tt_id)
+            except EpisodeIndexError as e:
+                located = None
+                self.ui_updates.post(None, self._set_status, f"⚠️ {e}")
+            if located and priority.preferred is None:
+                series_id, season, ep_num = located
+                priority.prefer(season)
+                _progress(
+                    f"{tt_id} is S{season}.E{ep_num:02d} of {series_id} (local index) — fetching the series..."
                 )
-                episodes_by_season[season] = [
-                    (ep_num, ep_tt) for ep_num, ep_tt in episode_ids.items()
-                ]
 
-            self.root.after(
-                0, self._display_episodes, root_id, episodes_by_season, season_amount
-            )
+            try:
+                job = self.prefetcher.claim(tt_id)
+                if job:
+                    job.priority.prefer(priority.preferred)
+                    self.ui_updates.post(None, self._adopt_priority, tt_id, job.priority)
+                    result = job.wait(_progress, _season, _incomplete)
+                else:
+                    result = fetch_series(
+                        tt_id, on_progress=_progress, priority=priority, on_season=_season,
+                        on_incomplete=_incomplete,
+                    )
+            except Exception as e:
+                self.ui_updates.post(None, self._on_queue_failed, tt_id, e)
+            else:
+                self.ui_updates.post(None, self._on_queue_done, tt_id, result)
+
+    def _on_queue_progress(self, tt_id: str, msg: str):
+        item = self.queue_items.get(tt_id)
+        if not item:
+            return
+        item["state"] = "running"
+        if self.queue_tree.exists(tt_id):
+            self.queue_tree.set(tt_id, "status", msg)
+        if tt_id == self.pending_show:
+            self._set_status(msg)
+
+    def _adopt_priority(self, tt_id: str, priority: SeasonPriority):
+        """A claimed prefetch keeps its own priority; steer that one from now on."""
+        item = self.queue_items.get(tt_id)
+        if item:
+            priority.prefer(item["priority"].preferred)
+            item["priority"] = priority
+
+    def _on_queue_season(
+            self, tt_id: str, series_id: str, season: int, episodes: list[tuple], seasons: list[int]
+    ):
+        item = self.queue_items.get(tt_id)
+        if not item or item["state"] in ("done", "failed"):
+            return
+        item["partial"][season] = episodes
+        item["series"] = series_id
+        item["seasons"] = seasons
+        if tt_id in (self.pending_show, self.shown_title):
+            self.ui_updates.post(("partial", tt_id), self._show_partial, tt_id)
+
+    def _show_partial(self, tt_id: str):
+        """Show the seasons of a running lookup that have arrived so far."""
+        item = self.queue_items.get(tt_id)
+        if not item or item["state"] in ("done", "failed") or not item["partial"]:
+            return
+        if tt_id not in (self.pending_show, self.shown_title):
+            return
+        if self.auto_copy_active and tt_id != self.shown_title:
+            self._stop_auto_copy()
+        self.shown_title = tt_id
+        self._display_episodes(
+            item["series"], dict(sorted(item["partial"].items())), len(item["seasons"]),
+            season_values=item["seasons"],
+        )
+
+    def _on_season_changed(self):
+        """Fetch the selected season next if the shown title is still loading."""
+        item = self.queue_items.get(self.shown_title)
+        if not item or item["state"] in ("done", "failed"):
+            return
+        try:
+            season = int(self.season_var.get())
+        except ValueError:
+            return
+        item["priority"].prefer(season)
+        if season not in self.episodes_by_season and season in item.get("seasons", ()):
+            self._set_status(f"Season {season} will be fetched next...")
+
+    def _on_queue_incomplete(self, tt_id: str, error: IncompleteSeason):
+        item = self.queue_items.get(tt_id)
+        if item:
+            item["incomplete"][error.season] = (len(error.episodes), error.total)
+
+    def _incomplete_note(self, tt_id: str) -> str:
+        """Which seasons of a finished lookup came back short, for the status line."""
+        item = self.queue_items.get(tt_id)
+        if not item or not item["incomplete"]:
+            return ""
+        return "incomplete: " + ", ".join(
+            f"S{season} {found}/{total}"
+            for season, (found, total) in sorted(item["incomplete"].items())
+        )
+
+    def _status_note(self, tt_id: str) -> str:
+        """Short seasons and a failed episode index, appended to the status line."""
+        error = episode_index_error()
+        notes = [self._incomplete_note(tt_id), f"⚠️ {error}" if error else ""]
+        return " • ".join(note for note in notes if note)
 
-        except Exception as e:
-            self.root.after(0, self._set_status, f"Error: {e}")
-            self.root.after(0, self._set_busy, False)
+    def _on_queue_done(self, tt_id: str, result: tuple[str, dict[int, list[tuple]], int]):
+        item = self.queue_items.get(tt_id)
+        if not item:
+            return
+        item["state"] = "done"
+        item["result"] = result
+        item["partial"] = {}
+        series_id, episodes_by_season, season_amount = result
+        total_episodes = sum(len(eps) for eps in episodes_by_season.values())
+        note = self._incomplete_note(tt_id)
+        if self.queue_tree.exists(tt_id):
+            self.queue_tree.item(tt_id, values=(
+                series_id,
+                f"{'⚠️' if note else '✅'} {total_episodes} episodes, "
+                f"{season_amount} season{'s' if season_amount != 1 else ''}"
+                + (f" ({note})" if note else ""),
+            ))
+        if tt_id == self.pending_show:
+            self._show_queue_result(tt_id)
+        elif tt_id == self.shown_title:
+            self._display_episodes(*result)  # replace the partial view
+            status_note = self._status_note(tt_id)
+            if status_note:
+                self._set_status(f"{self.status_var.get()} • {status_note}")
+        if tt_id == self.profiled_title and tt_id == self.shown_title:
+            self.root.update_idletasks()  # include layout of the new rows
+        self._finish_profile(tt_id)
+
+    def _on_queue_failed(self, tt_id: str, error: Exception):
+        item = self.queue_items.get(tt_id)
+        if not item:
+            return
+        item["state"] = "failed"
+        if self.queue_tree.exists(tt_id):
+            self.queue_tree.set(tt_id, "status", f"❌ {error}")
+        if tt_id == self.pending_show:
+            self.pending_show = None
+            self._set_status(f"Error: {error}")
+        self._finish_profile(tt_id)
+
+    def _on_queue_select(self, event):
+        selection = self.queue_tree.selection()
+        if not selection or selection[0] == self.shown_title:
+            return
+        tt_id = selection[0]
+        item = self.queue_items.get(tt_id)
+        if not item:
+            return
+        if item["state"] == "done":
+            self.pending_show = tt_id
+            self._show_queue_result(tt_id)
+        elif item["state"] == "failed":
+            self._enqueue_titles([tt_id])
+            self.pending_show = tt_id
+        else:
+            self.pending_show = tt_id
+            self._set_status(f"{tt_id} will be shown when it finishes.")
+
+    def _show_queue_result(self, tt_id: str):
+        # Auto copy may already be running on a season shown while loading
+        if self.auto_copy_active and tt_id != self.shown_title:
+            self._stop_auto_copy()
+        self.pending_show = None
+        self.shown_title = tt_id
+        if self.queue_tree.exists(tt_id) and self.queue_tree.selection() != (tt_id,):
+            self.queue_tree.selection_set(tt_id)
+            self.queue_tree.see(tt_id)
+        self._display_episodes(*self.queue_items[tt_id]["result"])
+        note = self._status_note(tt_id)
+        if note:
+            self._set_status(f"{self.status_var.get()} • {note}")
+        # A searched-for episode is found in the result itself, no index needed
+        series_id, episodes_by_season, _ = self.queue_items[tt_id]["result"]
+        for season, eps in episodes_by_season.items():
+            for ep_num, ep_tt in eps:
+                if ep_tt == tt_id:
+                    self._reveal_episode(tt_id, series_id, season, ep_num)
+                    return
+
+    def _reveal_episode(self, ep_tt: str, series_id: str, season: int, ep_num: int):
+        """Select the season of an episode that was searched for and scroll to it."""
+        if season not in self.episodes_by_season:
+            return
+        self.season_var.set(str(season))
+        for index, row in enumerate(self.episode_rows):
+            if row["ep_tt"] == ep_tt:
+                self._highlight_row(index)
+                break
+        self._set_status(f"{self.status_var.get()} • {ep_tt} is S{season}.E{ep_num:02d}")
+
+    def _clear_finished(self):
+        for tt_id, item in list(self.queue_items.items()):
+            if item["state"] in ("done", "failed") and tt_id != self.shown_title:
+                del self.queue_items[tt_id]
+                if self.queue_tree.exists(tt_id):
+                    self.queue_tree.delete(tt_id)
+
+    def _finish_profile(self, tt_id: str):
+        """Write the profile report if *tt_id* is the lookup being profiled."""
+        if not self.profiler or tt_id != self.profiled_title:
+            return
+        profiler, self.profiler, self.profiled_title = self.profiler, None, None
+        report_path = profiler.stop()
+        self._set_status(f"{self.status_var.get()} • profile: {report_path}")
 
     def _display_episodes(
-            self, root_id: str, episodes_by_season: dict[int, list[tuple]], season_amount: int
+            self, root_id: str, episodes_by_season: dict[int, list[tuple]], season_amount: int,
+            season_values: Optional[list[int]] = None,
     ):
-        for widget in self.inner_frame.winfo_children():
-            widget.destroy()
-
-        self.episodes_by_season = {}
-        self.episode_rows = []
+        """Draw the episode list; *season_values* lists every season while some are loading."""
+        # Redrawing the same series (more seasons arrived) only adds the new
+        # seasons' widgets and keeps the selection and scroll
+        refresh = (
+            root_id == self.displayed_series
+            and (season_amount > 1) == (self.season_amount > 1)
+        )
+        self.displayed_series = root_id
         self.season_amount = season_amount
+        if not refresh:
+            for widget in self.inner_frame.winfo_children():
+                widget.destroy()
+            self.episodes_by_season = {}
+            self.season_frames = {}
+            self._draw_title_row(root_id)
+
+        for season in [s for s in self.season_frames if s not in episodes_by_season]:
+            self.season_frames.pop(season).destroy()
+            del self.episodes_by_season[season]
+        for season, eps in episodes_by_season.items():
+            shown = self.episodes_by_season.get(season)
+            if shown is not None and [(r["ep_num"], r["ep_tt"]) for r in shown] == list(eps):
+                continue
+            if season in self.season_frames:
+                self.season_frames.pop(season).destroy()
+            self._draw_season(season, eps)
 
-        # --- Root title ID row ---
+        self.episodes_by_season = dict(sorted(self.episodes_by_season.items()))
+        self.episode_rows = [row for rows in self.episodes_by_season.values() for row in rows]
+        total_episodes = len(self.episode_rows)
+
+        # Update season spinbox
+        # Season values as IMDb labels them (may be years, e.g. 2019)
+        season_values = season_values or list(episodes_by_season) or [1]
+        self.season_spinbox.configure(values=season_values)
+        if not (refresh and self.season_var.get() in map(str, season_values)):
+            self.season_var.set(str(next(iter(episodes_by_season), season_values[0])))
+        # The spinbox stays locked while auto copy runs on a season shown early
+        if not self.auto_copy_active:
+            self.season_spinbox.configure(state=tk.NORMAL if season_amount > 1 else tk.DISABLED)
+
+        self.copy_all_btn.configure(state=tk.NORMAL)
+        self.auto_copy_btn.configure(state=tk.NORMAL)
+        if not refresh:
+            self.auto_copy_status.set("")
+        loading = len(episodes_by_season) < season_amount
+        if loading:
+            self._set_status(
+                f"Loading {root_id} • {len(episodes_by_season)}/{season_amount} seasons ready"
+            )
+        else:
+            self._set_status(
+                f"Done — {root_id} • {total_episodes} episodes across {season_amount} season{'s' if season_amount != 1 else ''}"
+            )
+
+        if not refresh:
+            self.canvas.yview_moveto(0)
+
+    def _draw_title_row(self, root_id: str):
         root_row = ttk.Frame(self.inner_frame)
         root_row.pack(fill=tk.X, padx=5, pady=(5, 8))
 
@@ -554,70 +955,54 @@ class IMDbLookupApp:
 
         ttk.Separator(self.inner_frame, orient=tk.HORIZONTAL).pack(fill=tk.X, padx=5, pady=(0, 5))
 
-        total_episodes = 0
-        for season, eps in episodes_by_season.items():
-            season_rows = []
-
-            if season_amount > 1:
-                header = ttk.Label(
-                    self.inner_frame,
-                    text=f"── Season {season} ──",
-                    font=("Consolas", 11, "bold"),
-                )
-                header.pack(fill=tk.X, padx=5, pady=(8, 2))
-
-            for ep_num, ep_tt in eps:
-                ep_text = f"{str(ep_num).zfill(2)} [imdbid-{ep_tt}]"
-                row_data = {"ep_num": ep_num, "ep_tt": ep_tt, "text": ep_text, "season": season}
-                season_rows.append(row_data)
-                self.episode_rows.append(row_data)
-
-                row = ttk.Frame(self.inner_frame)
-                row.pack(fill=tk.X, padx=5, pady=1)
+    def _draw_season(self, season: int, eps: list[tuple]):
+        """Add one season's header and rows, in season order among those shown."""
+        season_frame = ttk.Frame(self.inner_frame)
+        later = [s for s in self.season_frames if s > season]
+        if later:
+            season_frame.pack(fill=tk.X, before=self.season_frames[min(later)])
+        else:
+            season_frame.pack(fill=tk.X)
+        self.season_frames[season] = season_frame
 
-                label = ttk.Label(
-                    row, text=ep_text, font=("Consolas", 11), anchor=tk.W
-                )
-                label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        if self.season_amount > 1:
+            header = ttk.Label(
+                season_frame,
+                text=f"── Season {season} ──",
+                font=("Consolas", 11, "bold"),
+            )
+            header.pack(fill=tk.X, padx=5, pady=(8, 2))
 
-                copy_btn = ttk.Button(
-                    row,
-                    text="📋",
-                    width=3,
-                    command=lambda t=ep_text: self._copy_single(t),
-                )
-                copy_btn.pack(side=tk.RIGHT, padx=(5, 0))
+        season_rows = []
+        for ep_num, ep_tt in eps:
+            ep_text = f"{str(ep_num).zfill(2)} [imdbid-{ep_tt}]"
+            season_rows.append({"ep_num": ep_num, "ep_tt": ep_tt, "text": ep_text, "season": season})
 
-            self.episodes_by_season[season] = season_rows
-            total_episodes += len(season_rows)
+            row = ttk.Frame(season_frame)
+            row.pack(fill=tk.X, padx=5, pady=1)
 
-        # Update season spinbox
-        self.season_var.set("1")
-        self.season_spinbox.configure(from_=1, to=max(1, season_amount))
-        if season_amount > 1:
-            self.season_spinbox.configure(state=tk.NORMAL)
-        else:
-            self.season_spinbox.configure(state=tk.DISABLED)
+            label = ttk.Label(
+                row, text=ep_text, font=("Consolas", 11), anchor=tk.W
+            )
+            label.pack(side=tk.LEFT, fill=tk.X, expand=True)
 
-        self.copy_all_btn.configure(state=tk.NORMAL)
-        self.auto_copy_btn.configure(state=tk.NORMAL)
-        self.auto_copy_status.set("")
-        self._set_status(
-            f"Done — {root_id} • {total_episodes} episodes across {season_amount} season{'s' if season_amount != 1 else ''}"
-        )
-        self._set_busy(False)
+            copy_btn = ttk.Button(
+                row,
+                text="📋",
+                width=3,
+                command=lambda t=ep_text: self._copy_single(t),
+            )
+            copy_btn.pack(side=tk.RIGHT, padx=(5, 0))
 
-        self.canvas.yview_moveto(0)
+        self.episodes_by_season[season] = season_rows
 
     def _copy_single(self, text: str):
-        self.root.clipboard_clear()
-        self.root.clipboard_append(text)
+        self._set_clipboard(text)
         self._set_status(f"Copied: {text}")
 
     def _copy_all(self):
-        self.root.clipboard_clear()
         all_text = "\n".join(row["text"] for row in self.episode_rows)
-        self.root.clipboard_append(all_text)
+        self._set_clipboard(all_text)
         self._set_status("Copied all episode IDs to clipboard!")
 
     # --- Auto Copy (one season at a time) ---
@@ -636,7 +1021,11 @@ class IMDbLookupApp:
             return
 
         if selected_season not in self.episodes_by_season:
-            self._set_status(f"Season {selected_season} not found.")
+            item = self.queue_items.get(self.shown_title)
+            if item and item["state"] not in ("done", "failed"):
+                self._set_status(f"Season {selected_season} is still loading — try again in a moment.")
+            else:
+                self._set_status(f"Season {selected_season} not found.")
             return
 
         season_rows = self.episodes_by_season[selected_season]
@@ -652,7 +1041,9 @@ class IMDbLookupApp:
 
         self.auto_copy_active = True
         self.auto_copy_index = 0
+        self.auto_copy_started_at = time.monotonic()
         self.auto_copy_btn.configure(text="⏹ Stop")
+        self.adaptive_check.configure(state=tk.DISABLED)
         self.interval_entry.configure(state=tk.DISABLED)
         self.season_spinbox.configure(state=tk.DISABLED)
         self.reverse_check.configure(state=tk.DISABLED)
@@ -660,10 +1051,12 @@ class IMDbLookupApp:
 
     def _stop_auto_copy(self):
         self.auto_copy_active = False
+        self.clip_generation += 1
         if self.auto_copy_after_id:
             self.root.after_cancel(self.auto_copy_after_id)
             self.auto_copy_after_id = None
         self.auto_copy_btn.configure(text="▶ Start Auto Copy")
+        self.adaptive_check.configure(state=tk.NORMAL)
         self.interval_entry.configure(state=tk.NORMAL)
         self.reverse_check.configure(state=tk.NORMAL)
         if self.season_amount > 1:
@@ -679,9 +1072,15 @@ class IMDbLookupApp:
         if self.auto_copy_index >= total:
             selected_season = int(self.season_var.get())
             direction = " (reversed)" if self.reverse_var.get() else ""
-            self.auto_copy_status.set(f"✅ Done — Season {selected_season}{direction} complete!")
+            elapsed = time.monotonic() - self.auto_copy_started_at
+            self.auto_copy_status.set(
+                f"✅ Done — Season {selected_season}{direction} complete! "
+                f"{total} in {elapsed:.0f}s ({self._auto_copy_rate(total):.1f}/min)"
+            )
             self.auto_copy_active = False
+            self.clip_generation += 1
             self.auto_copy_btn.configure(text="▶ Start Auto Copy")
+            self.adaptive_check.configure(state=tk.NORMAL)
             self.interval_entry.configure(state=tk.NORMAL)
             self.reverse_check.configure(state=tk.NORMAL)
             if self.season_amount > 1:
@@ -691,12 +1090,16 @@ class IMDbLookupApp:
             return
 
         row = self.auto_copy_season_rows[self.auto_copy_index]
-        self.root.clipboard_clear()
-        self.root.clipboard_append(row["text"])
+        adaptive = self.adaptive_var.get()
+        if adaptive and self._is_x11():
+            self._serve_clipboard(row["text"])
+        else:
+            self._set_clipboard(row["text"])
 
-        self.auto_copy_status.set(
-            f"[{self.auto_copy_index + 1}/{total}] {row['text']}"
-        )
+        status = f"[{self.auto_copy_index + 1}/{total}] {row['text']}"
+        if self.auto_copy_index:
+            status += f" • {self._auto_copy_rate(self.auto_copy_index):.1f}/min"
+        self.auto_copy_status.set(status)
         if self.sound_enabled.get():
             play_sound(COPY_SOUND)
         self._set_status(f"Auto-copied: {row['text']}")
@@ -715,7 +1118,75 @@ class IMDbLookupApp:
         except ValueError:
             interval_ms = 2000
 
+        # In adaptive mode the interval is only a timeout
         self.auto_copy_after_id = self.root.after(interval_ms, self._auto_copy_next)
+        if adaptive and not self._is_x11():
+            self._watch_clipboard(self.clip_generation, row["text"])
+
+    def _auto_copy_rate(self, copied: int) -> float:
+        """Episodes copied per minute since auto copy started."""
+        elapsed = max(time.monotonic() - self.auto_copy_started_at, 1e-6)
+        return copied / elapsed * 60
+
+    # --- Adaptive auto copy: advance once the copied ID has been used ---
+
+    def _is_x11(self) -> bool:
+        return self.root.tk.call("tk", "windowingsystem") == "x11"
+
+    def _serve_clipboard(self, text: str):
+        """Own CLIPBOARD directly so reads by other apps are seen (X11 only)."""
+        self.clip_generation += 1
+        generation = self.clip_generation
+        self.served_text = text
+        self.served_generation = generation
+        self.served_at = time.monotonic()
+        self.last_clipboard = text
+        if not self.clip_handlers_installed:
+            for target in ("UTF8_STRING", "STRING"):
+                self.root.selection_handle(
+                    self._on_clipboard_read, selection="CLIPBOARD", type=target
+                )
+            self.clip_handlers_installed = True
+        self.root.selection_own(
+            selection="CLIPBOARD",
+            command=lambda: self._on_clipboard_lost(generation, text),
+        )
+
+    def _on_clipboard_read(self, offset, max_chars) -> str:
+        offset, max_chars = int(offset), int(max_chars)
+        if offset == 0 and time.monotonic() - self.served_at >= CLIPBOARD_READ_GRACE:
+            self.root.after_idle(self._on_clipboard_consumed, self.served_generation)
+        return self.served_text[offset:offset + max_chars]
+
+    def _on_clipboard_lost(self, generation: int, text: str):
+        """Another owner took CLIPBOARD — usually a clipboard manager, not a paste.
+
+        Pastes are no longer visible to us, so only a replaced text advances
+        early; otherwise the interval does.
+        """
+        self._watch_clipboard(generation, text)
+
+    def _watch_clipboard(self, generation: int, text: str):
+        """Poll for the clipboard being replaced (platforms without read events)."""
+        if generation != self.clip_generation or not self.auto_copy_active:
+            return
+        try:
+            current = self.root.clipboard_get()
+        except tk.TclError:
+            current = None
+        if current != text:
+            self._on_clipboard_consumed(generation)
+            return
+        self.root.after(100, self._watch_clipboard, generation, text)
+
+    def _on_clipboard_consumed(self, generation: int):
+        if generation != self.clip_generation or not self.auto_copy_active:
+            return
+        self.clip_generation += 1  # one advance per copied ID
+        if self.auto_copy_after_id:
+            self.root.after_cancel(self.auto_copy_after_id)
+        # Short grace period so the paste in progress can finish
+        self.auto_copy_after_id = self.root.after(150, self._auto_copy_next)
 
     def _highlight_row(self, index: int):
         """Scroll the canvas so the given episode row index is visible."""
@@ -727,6 +1198,7 @@ class IMDbLookupApp:
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # parse workers in PyInstaller builds
     root = tk.Tk()
     app = IMDbLookupApp(root)
     root.mainloop()
@@ -0,0 +1,106 @@
+"""Profiling mode: CPU profile, sampled stacks and peak memory for a lookup.
+
+Enable it with ``IMDB_PROFILE=<dir>`` (GUI: every Fetch is profiled from the
+click until the episode list is drawn) or ``python batch.py --profile <dir>``.
+Each run writes a folder containing:
+
+- ``cpu.prof``      — cProfile stats (``python -m pstats`` / snakeviz)
+- ``stacks.folded`` — sampled stacks of all threads in collapsed format
+                      (flamegraph.pl, speedscope, inferno)
+- ``report.txt``    — wall time, peak memory, top functions and allocations
+"""
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Optional
+
+PROFILE_DIR = os.environ.get("IMDB_PROFILE", "")
+
+
+class LookupProfiler:
+    """Collect CPU, stack-sample and memory data between ``start`` and ``stop``.
+
+    On Python 3.12+ cProfile sees every thread (fetch pool included); on
+    older versions only the thread that called ``start``. The stack sampler
+    always covers every thread.
+    """
+
+    def __init__(self, out_dir: str, label: str = "lookup", sample_interval: float = 0.005):
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        self.out_dir = os.path.join(out_dir, f"{stamp}-{label}")
+        self.label = label
+        self.sample_interval = sample_interval
+        self._profile = cProfile.Profile()
+        self._samples: Counter = Counter()
+        self._stop_event = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._started_at = 0.0
+
+    def start(self):
+        tracemalloc.start(25)
+        self._started_at = time.perf_counter()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+        self._sampler.start()
+        self._profile.enable()
+
+    def _sample(self):
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop_event.wait(self.sample_interval):
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(
+                        f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+                    )
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self._samples[";".join(reversed(stack))] += 1
+
+    def stop(self) -> str:
+        """Stop collecting, write the report files and return the report path."""
+        self._profile.disable()
+        wall = time.perf_counter() - self._started_at
+        self._stop_event.set()
+        if self._sampler:
+            self._sampler.join()
+        # Leave out the sampler's own bookkeeping
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, __file__)]
+        )
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        os.makedirs(self.out_dir, exist_ok=True)
+        self._profile.dump_stats(os.path.join(self.out_dir, "cpu.prof"))
+        with open(os.path.join(self.out_dir, "stacks.folded"), "w", encoding="utf-8") as f:
+            for stack, count in self._samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+        cpu_text = io.StringIO()
+        pstats.Stats(self._profile, stream=cpu_text).sort_stats("cumulative").print_stats(25)
+
+        report_path = os.path.join(self.out_dir, "report.txt")
+        with open(report_path, "w", encoding="utf-8") as f:
+            f.write(f"Profile of {self.label}\n")
+            f.write(f"Wall time:     {wall:.3f} s\n")
+            f.write(f"Peak memory:   {peak / 1024 / 1024:.2f} MiB (traced)\n")
+            f.write(f"Still held:    {current / 1024 / 1024:.2f} MiB\n")
+            f.write(f"Stack samples: {sum(self._samples.values())}\n\n")
+            f.write("== Top allocations by line ==\n")
+            for stat in snapshot.statistics("lineno")[:15]:
+                f.write(f"{stat}\n")
+            f.write("\n== CPU (top 25 by cumulative time) ==\n")
+            f.write(cpu_text.getvalue())
+        return report_path
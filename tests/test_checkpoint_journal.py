@@ -0,0 +1,57 @@
+import json
+import os
+import tempfile
+import unittest
+
+from imdb_lookup import CheckpointJournal
+
+
+class CheckpointJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "run.journal")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def _write_complete_run(self):
+        journal = CheckpointJournal(self.path)
+        journal.record_series("tt0000001", "tt0000001", "season", [1, 2])
+        journal.record_season("tt0000001", 1, [(1, "tt1001001"), (2, "tt1001002")])
+        journal.close()
+
+    def test_reload_restores_steps(self):
+        self._write_complete_run()
+        journal = CheckpointJournal(self.path)
+        self.assertEqual(journal.resolved("tt0000001"), ("tt0000001", "season", [1, 2]))
+        self.assertEqual(journal.seasons("tt0000001"), {1: [(1, "tt1001001"), (2, "tt1001002")]})
+        self.assertFalse(journal.is_done("tt0000001"))
+        journal.close()
+
+    def test_torn_last_line_is_ignored_and_next_record_starts_a_new_line(self):
+        self._write_complete_run()
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"event": "season", "series": "tt0000001", "season": 2, "epi')
+
+        journal = CheckpointJournal(self.path)
+        self.assertEqual(list(journal.seasons("tt0000001")), [1])
+        journal.record_done("tt0000001")
+        journal.close()
+
+        with open(self.path, encoding="utf-8") as f:
+            last = f.read().splitlines()[-1]
+        self.assertEqual(json.loads(last), {"event": "done", "title": "tt0000001"})
+        reopened = CheckpointJournal(self.path)
+        self.assertTrue(reopened.is_done("tt0000001"))
+        reopened.close()
+
+    def test_count_only_series_records_still_load(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"event": "series", "title": "tt1", "series": "tt2", "seasons": 3}) + "\n")
+        journal = CheckpointJournal(self.path)
+        self.assertEqual(journal.resolved("tt1"), ("tt2", "season", [1, 2, 3]))
+        journal.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
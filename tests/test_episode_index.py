@@ -0,0 +1,74 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import episode_index
+import imdb_lookup
+from episode_index import EpisodeIndex, EpisodeIndexError
+
+
+class EpisodeIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "index.db")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_add_and_lookup(self):
+        index = EpisodeIndex(self.path)
+        index.add_season("tt0000001", 1, [(1, "tt1001001"), (2, "tt1001002")])
+        index.add_season("tt0000002", 2020, [(1, "tt2020001")])
+        self.assertEqual(index.lookup("tt1001002"), ("tt0000001", 1, 2))
+        self.assertIsNone(index.lookup("tt9999999"))
+        self.assertEqual(index.counts(), (3, 2))
+        index.close()
+
+    def test_uses_rollback_journal(self):
+        index = EpisodeIndex(self.path)
+        self.assertEqual(index.db.execute("PRAGMA journal_mode").fetchone(), ("delete",))
+        index.close()
+
+    def test_damaged_file_raises(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a database" * 100)
+        with self.assertRaises(EpisodeIndexError) as caught:
+            EpisodeIndex(self.path)
+        self.assertIn(self.path, str(caught.exception))
+
+
+
+class SharedIndexTest(unittest.TestCase):
+    """How ``imdb_lookup`` copes with a failing index."""
+
+    def setUp(self):
+        self.path = os.path.join(self.enterContext(tempfile.TemporaryDirectory()), "index.db")
+        self.enterContext(mock.patch.object(episode_index, "INDEX_PATH", self.path))
+        self.enterContext(mock.patch.object(imdb_lookup, "_episode_index", None))
+        self.enterContext(mock.patch.object(imdb_lookup, "_episode_index_opened", False))
+        self.enterContext(mock.patch.object(imdb_lookup, "_episode_index_error", None))
+        self.stderr = io.StringIO()
+        self.enterContext(contextlib.redirect_stderr(self.stderr))
+
+    def test_damaged_index_is_reported_once_then_off(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a database" * 100)
+        with self.assertRaises(EpisodeIndexError):
+            imdb_lookup.locate_episode("tt1001001")
+        self.assertIsNone(imdb_lookup.locate_episode("tt1001001"))
+        self.assertIsInstance(imdb_lookup.episode_index_error(), EpisodeIndexError)
+        self.assertEqual(self.stderr.getvalue().count(self.path), 1)
+
+    def test_failed_write_keeps_the_season(self):
+        episodes = [(1, "tt1001001")]
+        imdb_lookup.episode_index().close()
+        self.assertEqual(imdb_lookup._index_season("tt0000001", 1, episodes), episodes)
+        self.assertIsNotNone(imdb_lookup.episode_index_error())
+        self.assertIsNone(imdb_lookup.episode_index())
+
+
+if __name__ == "__main__":
+    unittest.main()
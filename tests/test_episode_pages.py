@@ -0,0 +1,39 @@
+import unittest
+
+from imdb_lookup import IncompleteSeason, merge_episode_pages, page_count, season_from_pages
+
+
+def page(numbers, total=None, has_more=False):
+    return {
+        "episodes": [(n, f"tt{1000 + n}") for n in numbers],
+        "total": total,
+        "has_more": has_more,
+    }
+
+
+class EpisodePagesTest(unittest.TestCase):
+    def test_page_count_from_total(self):
+        self.assertEqual(page_count(page(range(1, 51), total=120)), 3)
+        self.assertEqual(page_count(page(range(1, 51), total=None)), 1)
+
+    def test_merge_drops_repeats_and_keeps_order(self):
+        merged = merge_episode_pages([page([1, 2, 3]), page([3, 4])])
+        self.assertEqual([n for n, _ in merged], [1, 2, 3, 4])
+
+    def test_complete_season(self):
+        pages = [page(range(1, 51), total=75), page(range(51, 76))]
+        self.assertEqual(len(season_from_pages("tt0000001", 1, pages)), 75)
+
+    def test_repeated_page_is_reported_short(self):
+        first = page(range(1, 51), total=120)
+        with self.assertRaises(IncompleteSeason) as caught:
+            season_from_pages("tt0000001", 1, [first, first, first])
+        self.assertEqual(len(caught.exception.episodes), 50)
+        self.assertEqual(caught.exception.total, 120)
+
+    def test_unknown_total_is_not_checked(self):
+        self.assertEqual(len(season_from_pages("tt0000001", 1, [page([1, 2])])), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
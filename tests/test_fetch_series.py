@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import imdb_lookup
+from imdb_lookup import CheckpointJournal, IncompleteSeason, fetch_series
+
+SHORT = [(n, f"tt2{n:06d}") for n in range(1, 51)]
+FULL = [(1, "tt1000001"), (2, "tt1000002")]
+
+
+def fake_season(root_id, kind, value):
+    if value == 2:
+        raise IncompleteSeason(root_id, value, SHORT, 180)
+    return FULL
+
+
+class FetchSeriesTest(unittest.TestCase):
+    """``fetch_series`` with the network calls replaced."""
+
+    def setUp(self):
+        patches = [
+            mock.patch.object(imdb_lookup, "extract_id", lambda tt_id: tt_id),
+            mock.patch.object(imdb_lookup, "find_listing", lambda url: ("season", [1, 2])),
+            mock.patch.object(imdb_lookup, "get_season_episodes", fake_season),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def test_short_season_keeps_the_rest_of_the_series(self):
+        reported, progress = [], []
+        series_id, episodes_by_season, season_amount = fetch_series(
+            "tt0000001", on_progress=progress.append, on_incomplete=reported.append,
+        )
+        self.assertEqual(episodes_by_season, {1: FULL, 2: SHORT})
+        self.assertEqual(season_amount, 2)
+        self.assertEqual([(e.season, e.total) for e in reported], [(2, 180)])
+        self.assertTrue(any("50 of 180" in msg for msg in progress))
+
+    def test_short_season_is_not_journaled(self):
+        journal = CheckpointJournal(os.path.join(self.dir.name, "run.journal"))
+        self.addCleanup(journal.close)
+        fetch_series("tt0000001", journal=journal)
+        self.assertEqual(journal.seasons("tt0000001"), {1: FULL})
+        self.assertFalse(journal.is_done("tt0000001"))
+
+
+if __name__ == "__main__":
+    unittest.main()
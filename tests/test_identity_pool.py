@@ -0,0 +1,121 @@
+import time
+import unittest
+
+from imdb_lookup import Identity, IdentityPool
+
+
+def bench_left(identity):
+    return identity.benched_until - time.monotonic()
+
+
+class IdentityPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.identities = [Identity(f"agent-{n}") for n in range(3)]
+        self.pool = IdentityPool(self.identities, bench_seconds=10.0)
+
+    def test_needs_an_identity(self):
+        with self.assertRaises(ValueError):
+            IdentityPool([])
+
+    def test_from_settings_pairs_agents_and_proxies(self):
+        pool = IdentityPool.from_settings(["a", "b"], ["direct", "http://127.0.0.1:3128"])
+        self.assertEqual(
+            [(i.user_agent, i.proxy) for i in pool.identities],
+            [("a", None), ("b", None), ("a", "http://127.0.0.1:3128"), ("b", "http://127.0.0.1:3128")],
+        )
+        self.assertEqual(pool.identities[2].proxies["https"], "http://127.0.0.1:3128")
+
+    def test_throttling_benches_at_once_and_backs_off(self):
+        identity = self.identities[0]
+        self.pool.report(identity, 429, 0.1)
+        self.assertAlmostEqual(bench_left(identity), 10.0, delta=1.0)
+        self.pool.report(identity, 429, 0.1)
+        self.assertAlmostEqual(bench_left(identity), 20.0, delta=1.0)
+        self.assertEqual(identity.throttled, 2)
+
+    def test_back_off_is_capped(self):
+        identity = self.identities[0]
+        for _ in range(10):
+            self.pool.report(identity, 429, 0.1)
+        self.assertLessEqual(bench_left(identity), IdentityPool.MAX_BENCH)
+
+    def test_three_failures_in_a_row_bench(self):
+        identity = self.identities[0]
+        self.pool.report(identity, 503, 0.1)
+        self.pool.report(identity, None, 0.1)
+        self.assertLessEqual(bench_left(identity), 0)
+        self.pool.report(identity, 500, 0.1)
+        self.assertGreater(bench_left(identity), 0)
+        self.assertEqual(identity.errors, 3)
+
+    def test_success_clears_strikes(self):
+        identity = self.identities[0]
+        self.pool.report(identity, 503, 0.1)
+        self.pool.report(identity, 503, 0.1)
+        self.pool.report(identity, 200, 0.1)
+        self.pool.report(identity, 503, 0.1)
+        self.assertLessEqual(bench_left(identity), 0)
+
+    def test_slow_identity_is_benched_and_reset_to_peer_median(self):
+        fast, medium, slow = self.identities
+        for _ in range(5):
+            self.pool.report(fast, 200, 0.1)
+            self.pool.report(medium, 200, 0.3)
+        for _ in range(4):
+            self.pool.report(slow, 200, 2.0)
+        self.assertLessEqual(bench_left(slow), 0)
+        self.pool.report(slow, 200, 2.0)
+        self.assertGreater(bench_left(slow), 0)
+        self.assertAlmostEqual(slow.latency, 0.2)
+
+    def test_unused_identities_are_not_peers(self):
+        busy = self.identities[0]
+        for _ in range(10):
+            self.pool.report(busy, 200, 5.0)
+        self.assertLessEqual(bench_left(busy), 0)
+        self.assertEqual(busy.latency, 5.0)
+
+    def test_acquire_skips_benched(self):
+        first, second, third = self.identities
+        self.pool.report(first, 429, 0.1)
+        self.pool.report(second, 429, 0.1)
+        for _ in range(20):
+            self.assertIs(self.pool.acquire(), third)
+
+    def test_fully_benched_pool_reports_the_wait(self):
+        first, second, third = self.identities
+        self.pool.report(first, 429, 0.1)
+        self.pool.report(first, 429, 0.1)
+        self.pool.report(second, 429, 0.1)
+        self.pool.report(third, 429, 0.1)
+        self.pool.report(third, 429, 0.1)
+        identity, delay = self.pool.try_acquire()
+        self.assertIsNone(identity)
+        self.assertAlmostEqual(delay, 10.0, delta=1.0)
+
+    def test_acquire_waits_for_the_first_due_back(self):
+        pool = IdentityPool(self.identities, bench_seconds=0.2)
+        for identity in self.identities:
+            pool.report(identity, 429, 0.1)
+        started = time.monotonic()
+        pool.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.15)
+
+    def test_stats(self):
+        self.pool.report(self.identities[0], 200, 0.25)
+        self.pool.report(self.identities[0], 429, 0.25)
+        stats = self.pool.stats()
+        self.assertEqual(len(stats), 3)
+        self.assertEqual(stats[0]["user_agent"], "agent-0")
+        self.assertEqual(stats[0]["proxy"], "direct")
+        self.assertEqual(stats[0]["requests"], 2)
+        self.assertEqual(stats[0]["throttled"], 1)
+        self.assertEqual(stats[0]["errors"], 0)
+        self.assertEqual(stats[0]["latency_ms"], 250)
+        self.assertEqual(stats[0]["error_rate"], 0.2)
+        self.assertGreater(stats[0]["benched_for"], 0)
+        self.assertEqual(stats[1]["benched_for"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+from main import UiUpdateQueue
+
+
+class FakeRoot:
+    """Stands in for ``tk.Tk``: keeps the scheduled drain instead of running a loop."""
+
+    def __init__(self):
+        self.scheduled = []
+        self.reported = []
+
+    def after(self, ms, callback):
+        self.scheduled.append(callback)
+
+    def report_callback_exception(self, exc_type, exc, tb):
+        self.reported.append(exc_type)
+
+
+class UiUpdateQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.root = FakeRoot()
+        self.queue = UiUpdateQueue(self.root)
+        self.ran = []
+
+    def drain(self):
+        self.root.scheduled.pop(0)()
+
+    def test_superseding_post_runs_after_earlier_posts(self):
+        self.queue.post("progress", self.ran.append, "progress 1")
+        self.queue.post(None, self.ran.append, "status")
+        self.queue.post("progress", self.ran.append, "progress 2")
+        self.drain()
+        self.assertEqual(self.ran, ["status", "progress 2"])
+
+    def test_unkeyed_posts_are_never_merged(self):
+        self.queue.post(None, self.ran.append, "a")
+        self.queue.post(None, self.ran.append, "a")
+        self.drain()
+        self.assertEqual(self.ran, ["a", "a"])
+
+    def test_failing_callback_does_not_stop_the_drain(self):
+        self.queue.post(None, lambda: 1 / 0)
+        self.queue.post(None, self.ran.append, "after")
+        self.drain()
+        self.assertEqual(self.ran, ["after"])
+        self.assertEqual(self.root.reported, [ZeroDivisionError])
+        self.assertEqual(len(self.root.scheduled), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
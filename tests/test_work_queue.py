@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+
+from work_queue import WorkQueue
+
+EPISODES = {1: [(1, "tt1001001"), (2, "tt1001002")]}
+
+
+class WorkQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        path = os.path.join(self.dir.name, "queue.db")
+        self.a = WorkQueue(path, max_attempts=2)
+        self.b = WorkQueue(path, max_attempts=2)
+
+    def tearDown(self):
+        self.a.close()
+        self.b.close()
+        self.dir.cleanup()
+
+    def _expire(self, title):
+        """Make the current lease on *title* look abandoned."""
+        self.a.db.execute("UPDATE jobs SET lease_expires = 0 WHERE title = ?", (title,))
+
+    def test_claims_each_title_once(self):
+        self.assertEqual(self.a.enqueue(["tt0000001", "tt0000002"]), 2)
+        self.assertEqual(self.a.enqueue(["tt0000001"]), 0)
+        self.assertEqual(self.a.claim("a"), "tt0000001")
+        self.assertEqual(self.b.claim("b"), "tt0000002")
+        self.assertIsNone(self.b.claim("b"))
+        self.assertEqual(self.a.counts(), {"leased": 2})
+
+    def test_expired_lease_is_reclaimed(self):
+        self.a.enqueue(["tt0000001"])
+        self.assertEqual(self.a.claim("a"), "tt0000001")
+        self.assertIsNone(self.b.claim("b"))
+        self._expire("tt0000001")
+        self.assertEqual(self.b.claim("b"), "tt0000001")
+
+    def test_heartbeat_fails_after_steal(self):
+        self.a.enqueue(["tt0000001"])
+        self.a.claim("a")
+        self.assertTrue(self.a.heartbeat("tt0000001", "a"))
+        self._expire("tt0000001")
+        self.b.claim("b")
+        self.assertFalse(self.a.heartbeat("tt0000001", "a"))
+        self.assertTrue(self.b.heartbeat("tt0000001", "b"))
+
+    def test_complete_refuses_lost_lease(self):
+        self.a.enqueue(["tt0000001"])
+        self.a.claim("a")
+        self._expire("tt0000001")
+        self.b.claim("b")
+        self.assertFalse(self.a.complete("tt0000001", "a", "tt0000001", EPISODES, 1))
+        self.assertEqual(list(self.a.results()), [])
+        self.assertTrue(self.b.complete("tt0000001", "b", "tt0000001", EPISODES, 1))
+        self.assertEqual(self.a.counts(), {"done": 1})
+        self.assertFalse(self.a.has_open_work())
+        (record,) = self.a.results()
+        self.assertEqual(record["series"], "tt0000001")
+
+    def test_fail_retries_until_max_attempts(self):
+        self.a.enqueue(["tt0000001"])
+        self.a.claim("a")
+        self.a.fail("tt0000001", "a", "boom")
+        self.assertEqual(self.a.counts(), {"pending": 1})
+        self.b.claim("b")
+        self.b.fail("tt0000001", "b", "boom again")
+        self.assertEqual(self.a.counts(), {"failed": 1})
+        self.assertIsNone(self.a.claim("a"))
+
+    def test_abandoned_last_attempt_is_marked_failed(self):
+        self.a.enqueue(["tt0000001"])
+        self.a.claim("a")
+        self._expire("tt0000001")
+        self.b.claim("b")
+        self._expire("tt0000001")
+        self.assertIsNone(self.a.claim("a"))
+        self.assertEqual(self.a.counts(), {"failed": 1})
+        row = self.a.db.execute("SELECT last_error FROM jobs").fetchone()
+        self.assertEqual(row, ("lease expired",))
+
+
+if __name__ == "__main__":
+    unittest.main()
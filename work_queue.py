@@ -0,0 +1,325 @@
+"""Shared work queue so several worker processes or hosts can split one backfill.
+
+The queue is a single SQLite file on storage every worker can reach:
+
+    python work_queue.py enqueue queue.db titles.txt
+    python work_queue.py work queue.db --worker-id host-a     # on each host
+    python work_queue.py status queue.db
+    python work_queue.py export queue.db results.jsonl
+
+Workers claim titles under a lease and renew it with a heartbeat while the
+lookup runs. Titles whose lease runs out (a crashed or cut-off worker) are
+claimed again by someone else, up to ``--max-attempts`` tries. Results go
+into the same database and ``export`` writes them in ``batch.py``'s format.
+
+The database uses SQLite's rollback journal rather than WAL, since WAL does
+not work over network filesystems. Lease times come from each host's clock,
+so keep hosts NTP-synced and the lease well above any clock skew.
+"""
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from typing import Optional
+
+from batch import print_identity_stats, read_titles, result_record
+from imdb_lookup import LookupCancelled, fetch_series
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    title         TEXT PRIMARY KEY,
+    state         TEXT NOT NULL DEFAULT 'pending',  -- pending, leased, done, failed
+    owner         TEXT,
+    lease_expires REAL,
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    last_error    TEXT,
+    updated       REAL
+);
+CREATE TABLE IF NOT EXISTS results (
+    title         TEXT PRIMARY KEY,
+    series        TEXT NOT NULL,
+    season_amount INTEGER NOT NULL,
+    seasons       TEXT NOT NULL,  -- JSON: [[season, [[ep_num, tt], ...]], ...]
+    worker        TEXT,
+    finished      REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, lease_expires);
+"""
+
+
+class WorkQueue:
+    """SQLite-backed job queue with leases. One instance per thread."""
+
+    def __init__(self, path: str, lease_seconds: float = 120.0, max_attempts: int = 3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.db = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=DELETE")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def _transaction(self):
+        """``BEGIN IMMEDIATE`` so two workers never claim the same row."""
+        return _Immediate(self.db)
+
+    def enqueue(self, titles: list[str]) -> int:
+        """Add titles not already queued; returns how many were new."""
+        with self._transaction():
+            before = self.db.total_changes
+            self.db.executemany(
+                "INSERT OR IGNORE INTO jobs (title, updated) VALUES (?, ?)",
+                [(title, time.time()) for title in titles],
+            )
+            return self.db.total_changes - before
+
+    def claim(self, worker_id: str) -> Optional[str]:
+        """Lease the next pending or abandoned title to *worker_id*."""
+        now = time.time()
+        with self._transaction():
+            # Abandoned on its last attempt: give up rather than retry forever
+            self.db.execute(
+                """
+                UPDATE jobs SET state = 'failed', owner = NULL, updated = ?,
+                                last_error = COALESCE(last_error, 'lease expired')
+                WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?
+                """,
+                (now, now, self.max_attempts),
+            )
+            row = self.db.execute(
+                """
+                SELECT title FROM jobs
+                WHERE (state = 'pending' OR (state = 'leased' AND lease_expires < ?))
+                  AND attempts < ?
+                ORDER BY rowid LIMIT 1
+                """,
+                (now, self.max_attempts),
+            ).fetchone()
+            if not row:
+                return None
+            self.db.execute(
+                """
+                UPDATE jobs SET state = 'leased', owner = ?, lease_expires = ?,
+                                attempts = attempts + 1, updated = ?
+                WHERE title = ?
+                """,
+                (worker_id, now + self.lease_seconds, now, row[0]),
+            )
+            return row[0]
+
+    def heartbeat(self, title: str, worker_id: str) -> bool:
+        """Extend the lease; False means it was lost to another worker."""
+        now = time.time()
+        with self._transaction():
+            cursor = self.db.execute(
+                """
+                UPDATE jobs SET lease_expires = ?, updated = ?
+                WHERE title = ? AND owner = ? AND state = 'leased'
+                """,
+                (now + self.lease_seconds, now, title, worker_id),
+            )
+            return cursor.rowcount == 1
+
+    def complete(
+            self, title: str, worker_id: str, series_id: str,
+            episodes_by_season: dict[int, list[tuple]], season_amount: int,
+    ) -> bool:
+        """Store the result and mark the title done (if we still hold it)."""
+        now = time.time()
+        with self._transaction():
+            cursor = self.db.execute(
+                """
+                UPDATE jobs SET state = 'done', lease_expires = NULL, last_error = NULL, updated = ?
+                WHERE title = ? AND owner = ? AND state = 'leased'
+                """,
+                (now, title, worker_id),
+            )
+            if cursor.rowcount != 1:
+                return False
+            self.db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    title, series_id, season_amount,
+                    json.dumps(sorted(episodes_by_season.items())), worker_id, now,
+                ),
+            )
+            return True
+
+    def fail(self, title: str, worker_id: str, error: str):
+        """Release the title for a retry, or mark it failed after the last attempt."""
+        with self._transaction():
+            self.db.execute(
+                """
+                UPDATE jobs SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                                owner = NULL, lease_expires = NULL, last_error = ?, updated = ?
+                WHERE title = ? AND owner = ? AND state = 'leased'
+                """,
+                (self.max_attempts, error, time.time(), title, worker_id),
+            )
+
+    def counts(self) -> dict[str, int]:
+        rows = self.db.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        return {state: count for state, count in rows}
+
+    def has_open_work(self) -> bool:
+        """True while any title is still pending or leased."""
+        row = self.db.execute(
+            "SELECT 1 FROM jobs WHERE state IN ('pending', 'leased') LIMIT 1"
+        ).fetchone()
+        return row is not None
+
+    def results(self):
+        for title, series_id, season_amount, seasons in self.db.execute(
+                "SELECT title, series, season_amount, seasons FROM results ORDER BY title"
+        ):
+            episodes_by_season = {
+                season: [tuple(ep) for ep in eps] for season, eps in json.loads(seasons)
+            }
+            yield result_record(title, series_id, episodes_by_season, season_amount)
+
+
+class _Immediate:
+    def __init__(self, db: sqlite3.Connection):
+        self.db = db
+
+    def __enter__(self):
+        self.db.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type, exc, tb):
+        self.db.execute("ROLLBACK" if exc_type else "COMMIT")
+
+
+def _work_on(queue: WorkQueue, path: str, title: str, worker_id: str):
+    """Run one leased lookup with a heartbeat thread renewing its lease."""
+    cancel = threading.Event()
+    finished = threading.Event()
+
+    def _heartbeat():
+        beat = WorkQueue(path, queue.lease_seconds, queue.max_attempts)
+        try:
+            while not finished.wait(queue.lease_seconds / 3):
+                if not beat.heartbeat(title, worker_id):
+                    cancel.set()  # lease lost — someone else owns it now
+                    return
+        finally:
+            beat.close()
+
+    beater = threading.Thread(target=_heartbeat, daemon=True)
+    beater.start()
+    try:
+        series_id, episodes_by_season, season_amount = fetch_series(
+            title,
+            on_progress=lambda msg: print(f"[{worker_id}] {title}: {msg}", file=sys.stderr),
+            cancel=cancel,
+        )
+    except LookupCancelled:
+        print(f"[{worker_id}] {title}: lease lost, dropped", file=sys.stderr)
+        return
+    except Exception as e:
+        finished.set()
+        queue.fail(title, worker_id, str(e))
+        print(f"[{worker_id}] {title}: Error: {e}", file=sys.stderr)
+        return
+    finally:
+        finished.set()
+        beater.join()
+
+    if not queue.complete(title, worker_id, series_id, episodes_by_season, season_amount):
+        print(f"[{worker_id}] {title}: lease lost before saving, dropped", file=sys.stderr)
+
+
+def run_worker(
+        path: str, worker_id: str, lease_seconds: float, max_attempts: int,
+        poll_seconds: float = 5.0,
+):
+    """Claim and process titles until nothing is pending or leased."""
+    queue = WorkQueue(path, lease_seconds, max_attempts)
+    try:
+        while True:
+            title = queue.claim(worker_id)
+            if title:
+                _work_on(queue, path, title, worker_id)
+            elif queue.has_open_work():
+                time.sleep(poll_seconds)  # others hold leases that may expire
+            else:
+                return
+    finally:
+        queue.close()
+
+
+def main_cli(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Shared IMDb lookup queue.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = commands.add_parser("enqueue", help="add titles to the queue")
+    enqueue.add_argument("db")
+    enqueue.add_argument("titles", help="file with one IMDb URL or tt ID per line")
+
+    work = commands.add_parser("work", help="process titles until the queue is drained")
+    work.add_argument("db")
+    work.add_argument(
+        "--worker-id", default=f"{socket.gethostname()}-{os.getpid()}",
+        help="unique name for this worker (default: host-pid)",
+    )
+    work.add_argument("--concurrency", type=int, default=1, help="titles worked at once")
+    work.add_argument("--lease", type=float, default=120.0, help="lease length in seconds")
+    work.add_argument("--max-attempts", type=int, default=3)
+
+    status = commands.add_parser("status", help="show job counts")
+    status.add_argument("db")
+
+    export = commands.add_parser("export", help="write results as JSON lines")
+    export.add_argument("db")
+    export.add_argument("output", nargs="?", help="output file (default: stdout)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "enqueue":
+        queue = WorkQueue(args.db)
+        added = queue.enqueue(read_titles(args.titles))
+        print(f"Queued {added} new title{'s' if added != 1 else ''}.", file=sys.stderr)
+        queue.close()
+
+    elif args.command == "work":
+        threads = [
+            threading.Thread(
+                target=run_worker,
+                args=(args.db, f"{args.worker_id}/{slot}", args.lease, args.max_attempts),
+            )
+            for slot in range(max(1, args.concurrency))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        print_identity_stats()
+
+    elif args.command == "status":
+        queue = WorkQueue(args.db)
+        counts = queue.counts()
+        queue.close()
+        for state in ("pending", "leased", "done", "failed"):
+            print(f"{state:8} {counts.get(state, 0)}")
+
+    elif args.command == "export":
+        queue = WorkQueue(args.db)
+        out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+        try:
+            for record in queue.results():
+                out.write(json.dumps(record) + "\n")
+        finally:
+            if out is not sys.stdout:
+                out.close()
+            queue.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())